@@ -3,9 +3,38 @@ Alfred - AI-powered code reviewer
 """
 
 __version__ = "0.1.0"
+MODEL = "claude-sonnet-4-20250514"
+CONFIG_PATH = "~/.alfred/config.json"
 
-from .agent import CodeReviewAgent
-from .cli import app
-from .config import Config
+# Printed by every way of asking for the version
+VERSION_TEXT = f"alfred {__version__}\nModel: {MODEL}\nConfig: {CONFIG_PATH}"
 
-__all__ = ["CodeReviewAgent", "app", "Config"]
\ No newline at end of file
+__all__ = ["CodeReviewAgent", "app", "Config", "get_config", "run"]
+
+
+def run():
+    """Console-script entry point"""
+    import sys
+    
+    # Answer version queries before typer, rich and the commands are imported
+    if sys.argv[1:] in (["version"], ["--version"], ["-V"]):
+        print(VERSION_TEXT)
+        return
+    
+    from .cli import app
+    app()
+
+
+def __getattr__(name):
+    # Loaded on first access so importing alfred (and `alfred --version`)
+    # doesn't pull in anthropic, typer or the JSON backend
+    if name == "CodeReviewAgent":
+        from .agent import CodeReviewAgent
+        return CodeReviewAgent
+    if name == "app":
+        from .cli import app
+        return app
+    if name in ("Config", "get_config"):
+        from . import config
+        return getattr(config, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,1451 @@
+"""
+Command implementations for the Alfred CLI
+alfred/cli.py declares the commands; their bodies live here so rich, the
+agent and GitHub modules are only imported when a command actually runs
+"""
+
+import typer
+from rich.console import Console
+from rich.panel import Panel
+from rich.prompt import Prompt, Confirm
+from contextlib import contextmanager
+from pathlib import Path
+import os
+import time
+from typing import Optional
+import subprocess
+import hashlib
+from .review_history import get_review_history
+from .config import get_config
+from . import storage
+from .focus import Focus
+
+
+console = Console()
+
+
+def _parse_github_remote(url: str) -> Optional[tuple[str, str]]:
+    """
+    Pull (owner, repo) out of a GitHub remote URL
+    
+    Handles https://github.com/owner/repo(.git) and git@github.com:owner/repo(.git)
+    with plain string operations.
+    
+    Returns:
+        Tuple of (owner, repo), or None if it isn't a GitHub repository URL
+    """
+    _, host, path = url.partition('github.com')
+    if not host or path[:1] not in (':', '/'):
+        return None
+    
+    path = path[1:]
+    if path.endswith('/'):
+        path = path[:-1]
+    path = path.removesuffix('.git')
+    
+    owner, _, repo = path.partition('/')
+    if not owner or not repo or '/' in repo:
+        return None
+    return owner, repo
+
+
+# Absolute path to git, looked up on first use
+_GIT = None
+
+
+def _git_executable() -> str:
+    """
+    Get the absolute path to git, searching PATH only once per process
+    
+    Raises:
+        FileNotFoundError: If git isn't installed
+    """
+    global _GIT
+    
+    if _GIT is None:
+        import shutil
+        _GIT = shutil.which('git')
+        if _GIT is None:
+            raise FileNotFoundError("git")
+    
+    return _GIT
+
+
+def _origin_url() -> Optional[str]:
+    """
+    Get the URL of the current repository's origin remote
+    
+    Reads .git/config directly to avoid spawning git; falls back to
+    `git remote get-url origin` for layouts it doesn't handle. Outside any
+    repository git isn't run at all.
+    
+    Returns:
+        Remote URL, or None if there is no repository or no origin
+    """
+    import configparser
+    
+    cwd = Path.cwd().resolve()
+    for directory in (cwd, *cwd.parents):
+        git_dir = directory / ".git"
+        if not git_dir.exists():
+            continue
+        
+        # A .git file (worktree, submodule) points elsewhere; leave those to git
+        if git_dir.is_dir():
+            parser = configparser.ConfigParser(strict=False, interpolation=None)
+            try:
+                parser.read(git_dir / "config")
+                url = parser.get('remote "origin"', 'url', fallback=None)
+            except configparser.Error:
+                url = None
+            if url:
+                return url
+        break
+    else:
+        # No repository above us, so git would only fail (unless GIT_DIR says otherwise)
+        if 'GIT_DIR' not in os.environ:
+            return None
+    
+    try:
+        return run_git('remote', 'get-url', 'origin').strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+
+# (owner, repo) of each working directory's origin, kept for the process
+_REPO_BY_CWD: dict = {}
+
+
+def _infer_repo() -> Optional[tuple[str, str]]:
+    """
+    Get (owner, repo) for the current directory's GitHub origin remote
+    
+    Returns:
+        Tuple of (owner, repo), or None if there is no GitHub origin
+    """
+    cwd = os.getcwd()
+    if cwd not in _REPO_BY_CWD:
+        url = _origin_url()
+        remote = _parse_github_remote(url) if url else None
+        if remote is None:
+            return None  # Not cached, so a remote added later is picked up
+        _REPO_BY_CWD[cwd] = remote
+    
+    return _REPO_BY_CWD[cwd]
+
+
+@contextmanager
+def spinner(description: str):
+    """Show a spinner with a description while the block runs"""
+    # Status is a bare spinner line; Progress also builds a task table
+    with console.status(description, spinner="dots"):
+        yield
+
+
+@contextmanager
+def live_review(title: str, placeholder: str):
+    """
+    Show a review panel that updates as text streams in
+    
+    Yields a callback taking the review text so far. Markdown is parsed
+    when built, so the panel is only rebuilt on a refresh and only when
+    the text has changed since the last one.
+    
+    Args:
+        title: Panel title
+        placeholder: Markdown shown until the first text arrives
+    """
+    from rich.live import Live
+    from rich.markdown import Markdown
+    
+    state = {"text": placeholder, "shown": None, "panel": None}
+    
+    def current_panel() -> Panel:
+        if state["text"] != state["shown"]:
+            state["panel"] = Panel(Markdown(state["text"]), title=title, border_style="green")
+            state["shown"] = state["text"]
+        return state["panel"]
+    
+    def on_text(text: str):
+        state["text"] = text
+    
+    with Live(console=console, refresh_per_second=20, get_renderable=current_panel):
+        yield on_text
+
+
+BANNER = "\n[bold cyan]🤖 Alfred[/bold cyan] [dim]v0.1.0[/dim]\n[dim]AI-Powered Code Review[/dim]\n"
+
+# Separator printed above review output
+HRULE = "\n" + "=" * 70 + "\n"
+
+
+def print_banner():
+    """Print simple banner (skipped when output isn't a terminal)"""
+    if not console.is_terminal:
+        return
+    console.print(BANNER)
+
+
+def _accept_api_key(prompt_text: str, confirm_prompt: str) -> Optional[str]:
+    """
+    Ask for an API key and check its format
+    
+    A key that doesn't look like an Anthropic key is only kept if the
+    user confirms it.
+    
+    Args:
+        prompt_text: Prompt shown when asking for the key
+        confirm_prompt: Question asked when the key doesn't look valid
+        
+    Returns:
+        The stripped key, or None if setup was cancelled
+    """
+    api_key = Prompt.ask(prompt_text, password=True)
+    
+    if not api_key or not api_key.strip():
+        console.print("[red]No key provided. Setup cancelled.[/red]")
+        return None
+    
+    api_key = api_key.strip()
+    
+    # Validate key format (basic check)
+    if not api_key.startswith("sk-ant-"):
+        console.print("\n[yellow]⚠️  Warning: API key doesn't look valid (should start with 'sk-ant-')[/yellow]")
+        if not Confirm.ask(confirm_prompt, default=False):
+            console.print("[red]Setup cancelled.[/red]")
+            return None
+    
+    return api_key
+
+
+def interactive_setup() -> Optional[str]:
+    """
+    Interactive setup when no API key is found
+    Returns the API key if user provides one, None if they skip
+    """
+    console.print("\n[yellow]❌ No API key found![/yellow]\n")
+    console.print("alfred needs an Anthropic API key to work.\n")
+    console.print("[cyan]Get your API key:[/cyan]")
+    console.print("  → https://console.anthropic.com/\n")
+    console.print("[dim]💡 Tip: New accounts get $5 in free credits![/dim]\n")
+    
+    # Ask if they want to set it up now
+    setup_now = Confirm.ask("Would you like to set up your API key now?", default=True)
+    
+    if not setup_now:
+        console.print("\n[yellow]Setup skipped. You can set up later with:[/yellow]")
+        console.print("  alfred setup")
+        console.print("\n[yellow]Or set environment variable:[/yellow]")
+        console.print("  export ANTHROPIC_API_KEY='your-key-here'\n")
+        return None
+    
+    # Get API key from user
+    api_key = _accept_api_key("\n[cyan]Paste your API key[/cyan]", "Continue anyway?")
+    if api_key is None:
+        return None
+    
+    # Save to config
+    config = get_config()
+    config.save_api_key(api_key)
+    
+    console.print(f"\n[green]✅ API key saved to {config.get_config_location()}[/green]")
+    console.print("[green]You're all set! alfred will use this key for all reviews.[/green]\n")
+    
+    return api_key
+
+
+def run_git_bytes(*args: str) -> bytes:
+    """
+    Run a read-only git command and return its raw stdout
+    
+    GIT_OPTIONAL_LOCKS=0 stops git from taking the index lock to write
+    back a refreshed index, which status and diff otherwise do.
+    
+    Args:
+        args: git arguments, e.g. ('diff', '--cached')
+        
+    Returns:
+        Command output, undecoded
+        
+    Raises:
+        subprocess.CalledProcessError: If git exits non-zero
+        FileNotFoundError: If git isn't installed
+    """
+    result = subprocess.run(
+        [_git_executable(), *args],
+        capture_output=True,
+        check=True,
+        env={**os.environ, 'GIT_OPTIONAL_LOCKS': '0'}
+    )
+    return result.stdout
+
+
+def run_git(*args: str) -> str:
+    """
+    Run a read-only git command and return its stdout as text
+    
+    Args:
+        args: git arguments, e.g. ('diff', '--cached')
+        
+    Returns:
+        Command output (undecodable bytes replaced)
+        
+    Raises:
+        subprocess.CalledProcessError: If git exits non-zero
+        FileNotFoundError: If git isn't installed
+    """
+    return run_git_bytes(*args).decode('utf-8', errors='replace')
+
+
+def count_diff_changes(diff: str) -> tuple[int, int]:
+    """
+    Count added and removed lines in a unified diff
+    
+    Uses str.count on line-start markers rather than splitting into lines;
+    +++/--- file headers are excluded.
+    
+    Args:
+        diff: Unified diff text
+        
+    Returns:
+        Tuple of (additions, deletions)
+    """
+    # Treat the first line like every other line start
+    first_add = diff.startswith('+') and not diff.startswith('+++')
+    first_del = diff.startswith('-') and not diff.startswith('---')
+    
+    additions = diff.count('\n+') - diff.count('\n+++') + first_add
+    deletions = diff.count('\n-') - diff.count('\n---') + first_del
+    return additions, deletions
+
+
+# Seconds a cached staged diff is served without re-running git diff
+_DIFF_CACHE_TTL = 60
+
+
+def _staged_diff_cache_file() -> Optional[Path]:
+    """
+    Cache file for the staged diff, keyed on HEAD and the index file
+    
+    git diff --cached only changes when HEAD or the index does, and any
+    git add/reset/commit rewrites the index, so its stat is a cheap key.
+    
+    Returns:
+        Path for the current repo state, or None if there is no commit yet
+    """
+    try:
+        git_dir, head = run_git('rev-parse', '--absolute-git-dir', 'HEAD').splitlines()
+        index = os.stat(os.path.join(git_dir, 'index'))
+    except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
+        return None
+    
+    key = f"{git_dir}\0{head}\0{index.st_mtime_ns}\0{index.st_size}"
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+    return get_config().config_dir / "diff_cache" / f"{digest}.diff"
+
+
+def get_git_diff(staged: bool = True, since: Optional[str] = None) -> tuple[str, str, tuple[int, int]]:
+    """
+    Get git diff
+    
+    Reads git's output in chunks. Once a diff is longer than the review
+    prompt keeps, only its start and its latest stretch are held, so a huge
+    diff comes back already truncated instead of being buffered whole.
+    
+    Args:
+        staged: Get staged changes (True) or unstaged (False)
+        since: Compare against branch/commit (e.g., 'main', 'HEAD~1')
+        
+    Returns:
+        Tuple of (diff_output, description, (additions, deletions)); the
+        counts cover the whole diff even when its text is truncated
+        
+    Raises:
+        ValueError: If git fails or isn't installed
+    """
+    import tempfile
+    from .agent import UTF8_CONTINUATION_BYTES
+    from .prompts import MAX_GIT_DIFF_CHARS, truncate_diff_ends
+    
+    if since:
+        # Compare against branch/commit
+        target = [since]
+        description = f"changes since {since}"
+    elif staged:
+        target = ['--cached']
+        description = "staged changes"
+    else:
+        target = []
+        description = "unstaged changes"
+    
+    # Re-running on an unchanged index reuses the last staged diff
+    cache_file = _staged_diff_cache_file() if staged and not since else None
+    if cache_file is not None:
+        try:
+            if time.time() - cache_file.stat().st_mtime < _DIFF_CACHE_TTL:
+                text = cache_file.read_text(encoding='utf-8')
+                return text, description, count_diff_changes(text)
+        except OSError:
+            pass
+    
+    # UTF-8 needs at most 4 bytes a character, so each end always holds
+    # what the prompt keeps
+    keep_bytes = 4 * MAX_GIT_DIFF_CHARS
+    head = bytearray()
+    tail = bytearray()
+    truncated = False
+    chars = additions = deletions = 0
+    # Treat the first line like every other line start
+    carry = b'\n'
+    
+    # stderr goes to a file rather than a pipe, so a chatty git can't fill
+    # it and stall while stdout is still being read
+    with tempfile.TemporaryFile() as stderr:
+        try:
+            # Plain unified diff: no external diff drivers or colour codes
+            proc = subprocess.Popen(
+                [_git_executable(), 'diff', '--no-ext-diff', '--no-color', *target],
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                env={**os.environ, 'GIT_OPTIONAL_LOCKS': '0'}
+            )
+        except FileNotFoundError:
+            raise ValueError("Git is not installed or not in PATH")
+        
+        with proc:
+            while chunk := proc.stdout.read(65536):
+                chars += len(chunk.translate(None, UTF8_CONTINUATION_BYTES))
+                
+                # Same markers as count_diff_changes; the carried bytes catch
+                # markers split across chunks without counting any twice
+                scan = carry + chunk
+                additions += scan.count(b'\n+', len(carry) - 1) - scan.count(b'\n+++', max(len(carry) - 3, 0))
+                deletions += scan.count(b'\n-', len(carry) - 1) - scan.count(b'\n---', max(len(carry) - 3, 0))
+                carry = scan[-3:]
+                
+                if len(head) < keep_bytes:
+                    room = keep_bytes - len(head)
+                    head += chunk[:room]
+                    chunk = chunk[room:]
+                tail += chunk
+                if len(tail) > 2 * keep_bytes:
+                    del tail[:-keep_bytes]
+                    truncated = True
+        
+        if proc.returncode != 0:
+            stderr.seek(0)
+            raise ValueError(f"Git command failed: {stderr.read().decode('utf-8', errors='replace')}")
+    
+    if truncated:
+        return truncate_diff_ends(
+            head.decode('utf-8', errors='replace'),
+            tail.decode('utf-8', errors='replace'),
+            chars,
+            MAX_GIT_DIFF_CHARS
+        ), description, (additions, deletions)
+    
+    text = (head + tail).decode('utf-8', errors='replace')
+    if cache_file is not None:
+        # Only the latest state is worth keeping
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        for old in cache_file.parent.glob("*.diff"):
+            old.unlink(missing_ok=True)
+        storage.atomic_write(cache_file, text.encode('utf-8'))
+    
+    return text, description, (additions, deletions)
+
+
+# History stores focus as a plain string; Focus is a str enum, so those
+# strings look up this table directly without building a Focus per row
+_FOCUS_EMOJIS = {focus: focus.emoji for focus in Focus}
+
+
+def _score_color(score: int) -> str:
+    """Rich color for a review score out of 10"""
+    return "green" if score >= 8 else "yellow" if score >= 6 else "red"
+
+
+def history(
+    action: str,
+    value: Optional[str],
+    limit: int,
+    file: Optional[str]
+):
+    """Run `alfred history`"""
+    history_tracker = get_review_history()
+    
+    if action == "list" or action == "history":
+        # List recent reviews (git log style!)
+        if file:
+            reviews = history_tracker.get_by_file(file)
+            console.print(f"\n[bold cyan]📚 Review History for {file}[/bold cyan]\n")
+        else:
+            reviews = history_tracker.get_recent(limit)
+            console.print(f"\n[bold cyan]📚 Recent Reviews[/bold cyan]\n")
+        
+        if not reviews:
+            console.print("[yellow]No reviews found yet[/yellow]\n")
+            console.print("[dim]Reviews will appear here after running:[/dim]")
+            console.print("  [cyan]alfred review <file>[/cyan]\n")
+            return
+        
+        # Display in git log style, built up and printed in one write
+        lines = []
+        for review in reviews:
+            # Review ID (like git commit hash)
+            lines.append(f"[yellow]review {review['id']}[/yellow]")
+            
+            # File and date
+            lines.append(f"📄 File:  [cyan]{review['filename']}[/cyan]")
+            lines.append(f"📅 Date:  {review['date']}")
+            
+            # Focus area with emoji
+            emoji = _FOCUS_EMOJIS.get(review['focus'], "🔍")
+            lines.append(f"{emoji} Focus: {review['focus']}")
+            
+            # Score with color coding
+            if review['score']:
+                score = review['score']
+                color = _score_color(score)
+                lines.append(f"⭐ Score: [{color}]{score}/10[/{color}]")
+            
+            # Cost
+            if review['cost']:
+                lines.append(f"💰 Cost:  [yellow]${review['cost']:.4f}[/yellow]")
+            
+            lines.append("")  # Blank line between reviews
+        
+        lines.append(f"[dim]View details:[/dim] [cyan]alfred history show <id>[/cyan]\n")
+        console.print("\n".join(lines))
+    
+    elif action == "show":
+        # Show specific review
+        if value is None:
+            console.print("[red]❌ Please specify review ID[/red]")
+            console.print("\n[cyan]Example:[/cyan] alfred history show 5\n")
+            raise typer.Exit(code=1)
+        
+        try:
+            review_id = int(value)
+        except ValueError:
+            console.print("[red]❌ Review ID must be a number[/red]")
+            raise typer.Exit(code=1)
+        
+        review = history_tracker.get_review(review_id)
+        
+        if not review:
+            console.print(f"[red]❌ Review #{review_id} not found[/red]\n")
+            raise typer.Exit(code=1)
+        
+        # Display review header
+        console.print(f"\n[bold cyan]Review #{review['id']}[/bold cyan]\n")
+        console.print(f"📄 File:  [cyan]{review['filepath']}[/cyan]")
+        console.print(f"📅 Date:  {review['date']}")
+        console.print(f"🔍 Focus: {review['focus']}")
+        
+        if review['score']:
+            score = review['score']
+            color = _score_color(score)
+            console.print(f"⭐ Score: [{color}]{score}/10[/{color}]")
+        
+        if review['cost']:
+            console.print(f"💰 Cost:  [yellow]${review['cost']:.4f}[/yellow]")
+        
+        console.print(HRULE)
+        
+        # Show review content
+        from rich.markdown import Markdown
+        md = Markdown(review['review'])
+        console.print(Panel(md, title="📋 Review", border_style="cyan"))
+        console.print()
+    
+    elif action == "search":
+        # Search reviews
+        if value is None:
+            console.print("[red]❌ Please specify search query[/red]")
+            console.print("\n[cyan]Example:[/cyan] alfred history search SQL\n")
+            raise typer.Exit(code=1)
+        
+        reviews = history_tracker.search(value)
+        
+        console.print(f"\n[bold cyan]🔍 Search: '{value}'[/bold cyan]\n")
+        
+        if not reviews:
+            console.print("[yellow]No matching reviews found[/yellow]\n")
+            return
+        
+        console.print(f"[green]Found {len(reviews)} match{'es' if len(reviews) != 1 else ''}[/green]\n")
+        
+        # Display search results (compact), printed in one write
+        lines = []
+        for review in reviews[:limit]:
+            lines.append(f"[yellow]review {review['id']}[/yellow] - [cyan]{review['filename']}[/cyan]")
+            lines.append(f"  📅 {review['date']}")
+            if review['score']:
+                score = review['score']
+                color = _score_color(score)
+                lines.append(f"  ⭐ [{color}]{score}/10[/{color}]")
+            lines.append("")
+        
+        if len(reviews) > limit:
+            lines.append(f"[dim]Showing {limit} of {len(reviews)}. Use --limit to see more.[/dim]\n")
+        
+        lines.append(f"[dim]View details:[/dim] [cyan]alfred history show <id>[/cyan]\n")
+        console.print("\n".join(lines))
+    
+    elif action == "stats":
+        # Show statistics
+        stats = history_tracker.get_stats()
+        
+        console.print("\n[bold cyan]📊 Review Statistics[/bold cyan]\n")
+        
+        if stats['total_reviews'] == 0:
+            console.print("[yellow]No reviews yet[/yellow]\n")
+            return
+        
+        # Stats and focus breakdown go out in one write
+        lines = [
+            f"📝 Total Reviews:     {stats['total_reviews']}",
+            f"📂 Files Reviewed:    {stats['files_reviewed']}",
+            f"⭐ Average Score:     {stats['avg_score']:.1f}/10"
+        ]
+        
+        if stats['total_cost'] > 0:
+            lines.append(f"💰 Total Cost:        [yellow]${stats['total_cost']:.2f}[/yellow]")
+        
+        # Focus breakdown
+        if stats['focus_breakdown']:
+            lines.append("\n[bold]Reviews by Focus:[/bold]")
+            lines.extend(
+                f"  {_FOCUS_EMOJIS.get(focus, '🔍')} {focus}: {count}"
+                for focus, count in stats['focus_breakdown'].items()
+            )
+        
+        lines.append("")
+        console.print("\n".join(lines))
+    
+    elif action == "export":
+        # Pretty-printed JSON, to a file or stdout
+        data = history_tracker.export()
+        
+        if value:
+            Path(value).write_bytes(data)
+            console.print(f"\n[green]✅ Exported history to {value}[/green]\n")
+        else:
+            typer.echo(data.decode('utf-8'))
+    
+    elif action == "clear":
+        # Clear all history
+        stats = history_tracker.get_stats()
+        
+        if stats['total_reviews'] == 0:
+            console.print("\n[yellow]No reviews to clear[/yellow]\n")
+            return
+        
+        console.print(f"\n[yellow]⚠️  This will delete {stats['total_reviews']} reviews[/yellow]")
+        confirm = Confirm.ask("Are you sure?", default=False)
+        
+        if confirm:
+            count = history_tracker.clear_all()
+            console.print(f"\n[green]✅ Deleted {count} reviews[/green]\n")
+        else:
+            console.print("\n[yellow]Cancelled[/yellow]\n")
+    
+    else:
+        console.print(f"[red]❌ Unknown action: {action}[/red]\n")
+        console.print("[cyan]Valid actions:[/cyan]")
+        console.print("  alfred history              # List recent")
+        console.print("  alfred history show 5       # Show review #5")
+        console.print("  alfred history search SQL   # Search reviews")
+        console.print("  alfred history stats        # Statistics")
+        console.print("  alfred history export FILE  # Export as JSON")
+        console.print("  alfred history clear        # Clear all\n")
+        raise typer.Exit(code=1)
+
+
+def review_git(
+    staged: bool,
+    since: Optional[str],
+    focus: Focus,
+    api_key: Optional[str],
+    show_cost: bool,
+    verbose: bool,
+    force: bool
+):
+    """Run `alfred review-git`"""
+    if verbose:
+        print_banner()
+    
+    # Check API key
+    config = get_config()
+    anthropic_key = config.get_api_key(api_key)
+    
+    if not anthropic_key:
+        console.print("[red]❌ Anthropic API key required. Run 'alfred setup'[/red]")
+        raise typer.Exit(code=1)
+    
+    from .agent import CodeReviewAgent, estimate_request_cost
+    from .api_balance_tracker import get_balance_tracker
+    
+    try:
+        # Get git diff
+        with spinner("Getting git diff..."):
+            diff, description, (additions, deletions) = get_git_diff(staged=staged, since=since)
+        
+        # Check if there are changes
+        if not diff.strip():
+            console.print(f"\n[yellow]No {description} to review[/yellow]\n")
+            if staged:
+                console.print("[dim]Tip: Use --unstaged to review uncommitted changes[/dim]")
+            elif not since:
+                console.print("[dim]Tip: Stage changes with 'git add' first[/dim]")
+            console.print()
+            raise typer.Exit(code=0)
+        
+        # Show what we're reviewing
+        console.print(f"\n📝 Reviewing: [cyan]{description}[/cyan]")
+        console.print(f"🎯 Focus: [cyan]{focus}[/cyan]\n")
+        
+        console.print(f"📊 Changes: [green]+{additions}[/green] [red]-{deletions}[/red]\n")
+        
+        # Check balance against an estimate for this diff (skipped with --no-cost)
+        if show_cost:
+            balance_tracker = get_balance_tracker()
+        if show_cost and not force:
+            from .prompts import get_git_diff_review_prompt
+            estimated_cost = estimate_request_cost(get_git_diff_review_prompt(diff, focus))
+            
+            should_proceed, warning = balance_tracker.check_before_review(estimated_cost=estimated_cost)
+            
+            if not should_proceed:
+                console.print(f"\n{warning}\n")
+                raise typer.Exit(code=1)
+            
+            if warning:
+                console.print(f"\n{warning}\n")
+                proceed = Confirm.ask("Continue anyway?", default=True)
+                if not proceed:
+                    console.print("\n[yellow]Review cancelled[/yellow]\n")
+                    raise typer.Exit(code=0)
+        
+        # Stream the review into a live panel
+        agent = CodeReviewAgent(api_key=anthropic_key, track_cost=show_cost)
+        console.print(HRULE)
+        with live_review("📋 Git Diff Review", "*🤖 Claude is reviewing your changes...*") as on_text:
+            review_result, cost_info = agent.review_git_diff(diff, focus, track_cost=show_cost, on_text=on_text)
+            on_text(review_result)
+        
+        # Save to history on a worker thread while the balance is refreshed;
+        # they read and write different files
+        from concurrent.futures import ThreadPoolExecutor
+        
+        history_tracker = get_review_history()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            saved = pool.submit(
+                history_tracker.save_review,
+                filepath=f"git-{description.replace(' ', '-')}",
+                review_text=review_result,
+                focus=focus,
+                cost=cost_info['cost'] if cost_info else None
+            )
+            
+            status = None
+            if show_cost and cost_info:
+                # Refreshed now that this review's cost is recorded
+                balance_tracker.invalidate()
+                status = balance_tracker.get_detailed_status()
+            
+            review_id = saved.result()
+        
+        # Show cost
+        if status is not None:
+            console.print("\n💰 [bold cyan]Cost Information:[/bold cyan]")
+            console.print(f"   Cost: [yellow]${cost_info['cost']:.4f}[/yellow]")
+            console.print(f"   [dim]Saved as review #{review_id}[/dim]")
+            
+            # Show balance
+            if status['has_balance']:
+                console.print(f"   Balance: ${status['balance']:.2f} (~{status['estimated_reviews_left']} reviews left)")
+        
+        console.print("\n[green]✅ Review complete![/green]")
+        console.print(f"[dim]View again:[/dim] [cyan]alfred history show {review_id}[/cyan]\n")
+        
+    except ValueError as e:
+        console.print(f"\n[red]❌ Error: {str(e)}[/red]\n")
+        raise typer.Exit(code=1)
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"\n[red]❌ Error: {str(e)}[/red]")
+        if verbose:
+            import traceback
+            console.print("\n[dim]" + traceback.format_exc() + "[/dim]")
+        raise typer.Exit(code=1)
+
+
+def review(
+    filepath: str,
+    focus: Focus,
+    api_key: Optional[str],
+    verbose: bool,
+    show_cost: bool,
+    use_cache: bool
+):
+    """Run `alfred review`"""
+    
+    if verbose:
+        print_banner()
+    
+    # Check for API key and offer interactive setup if missing
+    config = get_config()
+    current_key = config.get_api_key(api_key)
+    
+    if not current_key:
+        # Interactive setup
+        setup_key = interactive_setup()
+        if not setup_key:
+            raise typer.Exit(code=1)
+        # Use the newly set up key
+        api_key = setup_key
+    
+    from .agent import CodeReviewAgent, PromptTooLargeError
+    
+    try:
+        # Initialize agent
+        with spinner("Initializing alfred..."):
+            agent = CodeReviewAgent(api_key=api_key, track_cost=show_cost)
+        
+        # Show what we're reviewing
+        console.print(f"\n📄 Reviewing: [cyan]{filepath}[/cyan]")
+        console.print(f"🎯 Focus: [cyan]{focus}[/cyan]\n")
+        
+        # Stream the review into a live panel as Claude writes it
+        console.print(HRULE)
+        
+        with live_review("📋 Code Review Results", "*🤖 Claude is reviewing your code...*") as on_text:
+            review_result, cost_info = agent.review_code(
+                filepath,
+                focus,
+                track_cost=show_cost,
+                use_cache=use_cache,
+                on_text=on_text
+            )
+            on_text(review_result)
+
+        # save to history
+        history_tracker = get_review_history()
+        review_id = history_tracker.save_review(
+            filepath=filepath,
+            review_text=review_result,
+            focus=focus,
+            cost=cost_info['cost'] if cost_info else None
+        )
+
+        # Cost information (if enabled) and the footer go out in one write
+        lines = []
+        if show_cost and cost_info and cost_info.get('cached'):
+            lines += [
+                "\n💰 [bold cyan]Cost Information:[/bold cyan]",
+                "   Served from cache - no API cost",
+                "   [dim]Use --no-cache to request a fresh review[/dim]"
+            ]
+        elif show_cost and cost_info:
+            lines += [
+                "\n💰 [bold cyan]Cost Information:[/bold cyan]",
+                f"   Input tokens:  {cost_info['input_tokens']:,}",
+                f"   Output tokens: {cost_info['output_tokens']:,}",
+                f"   Total tokens:  {cost_info['total_tokens']:,}",
+                f"   Cost:          [yellow]${cost_info['cost']:.4f}[/yellow]"
+            ]
+            
+            # Show session total
+            session = agent.cost_tracker.get_session_summary()
+            if session['reviews'] > 1:
+                lines.append(f"\n   Session total: ${session['total_cost']:.4f} ({session['reviews']} reviews)")
+        
+        lines.append("\n[green]✅ Review complete![/green]\n")
+        console.print("\n".join(lines))
+        
+    except FileNotFoundError:
+        # Raised by the agent's read of the file; no separate exists() check
+        console.print(f"[red]❌ Error: File not found: {filepath}[/red]")
+        raise typer.Exit(code=1)
+    except PromptTooLargeError as e:
+        console.print(f"[red]❌ {str(e)}[/red]")
+        raise typer.Exit(code=1)
+    except ValueError as e:
+        console.print(f"[red]❌ Configuration Error: {str(e)}[/red]")
+        raise typer.Exit(code=1)
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]❌ Error: {str(e)}[/red]")
+        if verbose:
+            import traceback
+            console.print("\n[dim]" + traceback.format_exc() + "[/dim]")
+        raise typer.Exit(code=1)
+
+
+def setup():
+    """Run `alfred setup`"""
+    print_banner()
+    
+    console.print("\n[bold]alfred Setup[/bold]\n")
+    
+    config = get_config()
+    
+    # Show current configuration
+    if config.has_api_key():
+        masked_key = config.get_masked_key()
+        console.print(f"[green]✅ Current API key: {masked_key}[/green]")
+        console.print(f"[dim]Stored in: {config.get_config_location()}[/dim]\n")
+        
+        change = Confirm.ask("Would you like to change your API key?", default=False)
+        if not change:
+            console.print("\n[green]Setup complete! No changes made.[/green]\n")
+            return
+    else:
+        console.print("[yellow]No API key configured yet.[/yellow]\n")
+    
+    # Get new API key
+    console.print("[cyan]Get your API key from:[/cyan]")
+    console.print("  → https://console.anthropic.com/\n")
+    
+    api_key = _accept_api_key("[cyan]Enter your Anthropic API key[/cyan]", "Save anyway?")
+    if api_key is None:
+        return
+    
+    # Save configuration
+    config.save_api_key(api_key)
+    
+    console.print(f"\n[green]✅ API key saved to {config.get_config_location()}[/green]")
+    console.print("[green]🎉 Setup complete! Try running:[/green]")
+    console.print("  alfred review <your-file>\n")
+
+
+def revert():
+    """Run `alfred revert`"""
+    config = get_config()
+    
+    if config.has_api_key():
+        confirm = Confirm.ask(
+            "[yellow]⚠️  This will delete your saved API key. Continue?[/yellow]",
+            default=False
+        )
+        if confirm:
+            config.clear_config()
+            console.print("[green]✅ Configuration reverted to defaults.[/green]")
+        else:
+            console.print("[yellow]Revert cancelled.[/yellow]")
+    else:
+        console.print("[yellow]No configuration to revert.[/yellow]")
+
+
+def config_cmd(
+    show: bool,
+    reset: bool
+):
+    """Run `alfred config-cmd`"""
+    
+    config = get_config()
+    
+    if reset:
+        if config.has_api_key():
+            confirm = Confirm.ask(
+                "[yellow]⚠️  This will delete your saved API key. Continue?[/yellow]",
+                default=False
+            )
+            if confirm:
+                config.clear_config()
+                console.print("[green]✅ Configuration cleared.[/green]")
+            else:
+                console.print("[yellow]Reset cancelled.[/yellow]")
+        else:
+            console.print("[yellow]No configuration to reset.[/yellow]")
+        return
+    
+    # No other action given: show the configuration
+    lines = ["\n[bold]alfred Configuration[/bold]\n"]
+    
+    if config.has_api_key():
+        masked_key = config.get_masked_key()
+        lines.append(f"[green]API Key: {masked_key}[/green]")
+        lines.append(f"[dim]Location: {config.get_config_location()}[/dim]")
+    else:
+        lines.append("[yellow]API Key: Not configured[/yellow]")
+        lines.append("\n[cyan]Run 'alfred setup' to configure your API key[/cyan]")
+    
+    # One write for the whole block
+    console.print("\n".join(lines) + "\n")
+
+
+def costs(
+    limit: int,
+    total: bool
+):
+    """Run `alfred costs`"""
+    console.print("\n💰 [bold cyan]Alfred Cost Tracker[/bold cyan]\n")
+    
+    config = get_config()
+    from datetime import datetime
+    from .cost_tracker import CostTracker
+    tracker = CostTracker(config.config_dir)
+    
+    if total:
+        # Show all-time statistics
+        stats = tracker.get_total_usage()
+        
+        if stats['total_reviews'] == 0:
+            console.print("[yellow]No reviews tracked yet.[/yellow]")
+            console.print("\n[dim]Costs will be tracked automatically when you run 'alfred review'[/dim]\n")
+            return
+        
+        # Collected and printed in one write
+        lines = [
+            "[bold]All-Time Statistics:[/bold]",
+            f"  Total reviews:    {stats['total_reviews']:,}",
+            f"  Total tokens:     {stats['total_tokens']:,}",
+            f"  Total cost:       [yellow]${stats['total_cost']:.2f}[/yellow]",
+            f"  Avg per review:   ${stats['avg_cost_per_review']:.4f}",
+            f"  Avg tokens/review: {stats['avg_tokens_per_review']:.0f}"
+        ]
+        
+        # Cache savings
+        from .llm_cache import LLMCache
+        cache_stats = LLMCache(config.config_dir).get_stats()
+        if cache_stats['hits'] or cache_stats['misses']:
+            lines += [
+                "\n[bold]Response Cache:[/bold]",
+                f"  Hits:             {cache_stats['hits']:,}",
+                f"  Misses:           {cache_stats['misses']:,}",
+                f"  Hit rate:         {cache_stats['hit_rate']:.0%}"
+            ]
+        
+        console.print("\n".join(lines))
+    else:
+        # Show recent reviews
+        recent = tracker.get_recent_reviews(limit)
+        
+        if not recent:
+            console.print("[yellow]No reviews tracked yet.[/yellow]")
+            console.print("\n[dim]Costs will be tracked automatically when you run 'alfred review'[/dim]\n")
+            return
+        
+        console.print(f"[bold]Last {len(recent)} Reviews:[/bold]\n")
+        
+        from rich.table import Table
+        table = Table(show_header=True, header_style="bold cyan")
+        table.add_column("Date", style="dim")
+        table.add_column("File", style="cyan")
+        table.add_column("Tokens", justify="right")
+        table.add_column("Cost", justify="right", style="yellow")
+        
+        fromisoformat = datetime.fromisoformat  # Bound once, used per row
+        total_cost = 0.0
+        for review in recent:
+            total_cost += review['cost']
+            
+            # Parse timestamp
+            date_str = fromisoformat(review['timestamp']).strftime("%b %d, %H:%M")
+            
+            # Get filename or show "N/A"
+            filename = review.get('filepath', 'N/A')
+            if filename and filename != 'N/A':
+                filename = Path(filename).name
+            
+            # Format numbers
+            tokens = f"{review['total_tokens']:,}"
+            cost = f"${review['cost']:.4f}"
+            
+            table.add_row(date_str, filename, tokens, cost)
+        
+        console.print(table)
+        
+        # Show total for displayed reviews
+        console.print(f"\n[dim]Total shown: ${total_cost:.4f}[/dim]")
+    
+    console.print()
+
+
+def cache(
+    action: str
+):
+    """Run `alfred cache`"""
+    config = get_config()
+    from .llm_cache import LLMCache
+    review_cache = LLMCache(config.config_dir)
+    
+    if action == "stats":
+        stats = review_cache.get_stats()
+        
+        console.print("\n[bold cyan]🗄️  Review Cache[/bold cyan]\n")
+        console.print(f"  Hits:     {stats['hits']:,}")
+        console.print(f"  Misses:   {stats['misses']:,}")
+        console.print(f"  Hit rate: {stats['hit_rate']:.0%}")
+        console.print(f"\n[dim]Location: {review_cache.cache_dir}[/dim]\n")
+    
+    elif action == "clear":
+        count = review_cache.clear()
+        console.print(f"\n[green]✅ Cleared {count} cached review{'s' if count != 1 else ''}[/green]\n")
+    
+    else:
+        console.print(f"[red]❌ Unknown action: {action}[/red]\n")
+        console.print("[cyan]Valid actions:[/cyan]")
+        console.print("  alfred cache           # Statistics")
+        console.print("  alfred cache clear     # Clear all\n")
+        raise typer.Exit(code=1)
+
+
+def version():
+    """Run `alfred version`"""
+    from . import VERSION_TEXT
+    
+    # Same plain text as the fast path in alfred.run
+    print(VERSION_TEXT)
+
+
+def github_login():
+    """Run `alfred github-login`"""
+    print_banner()
+
+    from .github_auth import get_github_auth
+    github_auth = get_github_auth()
+
+    # Check if already logged in
+    session = github_auth.load_session()
+    if session is not None:
+        user_info = github_auth.get_user_info(session)
+        username = user_info.get('login', 'Unknown') if user_info else 'Unknown'
+        
+        console.print(f"\n[yellow]Already logged in as:[/yellow] [cyan]{username}[/cyan]")
+        
+        reauth = Confirm.ask("Would you like to login again?", default=False)
+        if not reauth:
+            console.print("[green]Keeping current session[/green]\n")
+            return
+        
+        github_auth.logout()
+
+    console.print("\n[bold cyan]🔐 GitHub Login[/bold cyan]\n")
+    console.print("Alfred needs permission to access your GitHub repositories.")
+    console.print("[dim]This uses GitHub's secure OAuth flow - Alfred never sees your password.[/dim]\n")
+
+    # Start login flow
+    with spinner("Initiating GitHub login..."):
+        login_result = github_auth.login()
+        
+        if not login_result.get('success'):
+            console.print(f"[red]❌ {login_result.get('error', 'Login failed')}[/red]\n")
+            return
+
+    # Display auth code
+    user_code = login_result['user_code']
+    verification_uri = login_result['verification_uri']
+    device_code = login_result['device_code']
+    interval = login_result.get('interval', 5)
+
+    # Launch the browser in the background; it starts up while the code is shown
+    import threading
+    import webbrowser
+
+    def open_browser():
+        try:
+            webbrowser.open(verification_uri)
+        except Exception:
+            console.print("[yellow]⚠️  Could not open browser automatically[/yellow]")
+
+    threading.Thread(target=open_browser, daemon=True).start()
+
+    # Create display panel
+    auth_panel = Panel(
+        f"[bold yellow]{user_code}[/bold yellow]\n\n"
+        f"[dim]Visit: {verification_uri}[/dim]",
+        title="🔑 Your Code",
+        border_style="cyan"
+    )
+
+    console.print("\n")
+    console.print(auth_panel)
+    console.print("\n[bold]Steps:[/bold]")
+    console.print("  1. A browser window will open")
+    console.print("  2. Enter the code shown above")
+    console.print("  3. Authorize Alfred")
+    console.print("\n[dim]Waiting for authorization...[/dim]\n")
+
+    # Poll for token on a worker thread. Ctrl-C interrupts the main thread,
+    # which wakes the worker's wait and lets it finish before exiting.
+    from concurrent.futures import ThreadPoolExecutor
+    try:
+        with spinner("Waiting for authorization..."), ThreadPoolExecutor(max_workers=1) as pool:
+            poll = pool.submit(github_auth.poll_for_token, device_code, interval)
+            try:
+                result = poll.result()
+            except KeyboardInterrupt:
+                github_auth.cancel_login()
+                raise
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Login cancelled[/yellow]\n")
+        raise typer.Exit(code=1)
+
+    if result['success']:
+        user_info = github_auth.get_user_info()
+        username = user_info.get('login', 'Unknown') if user_info else 'Unknown'
+        
+        console.print("\n[green]✅ Successfully logged in to GitHub![/green]")
+        console.print(f"[green]Logged in as:[/green] [cyan]{username}[/cyan]\n")
+        console.print("[dim]You can now use:[/dim]")
+        console.print("  • [cyan]alfred review-pr <url>[/cyan]")
+        console.print("  • [cyan]alfred review-pr <number> --comment[/cyan]\n")
+    else:
+        error = result.get('error', 'Unknown error')
+        console.print(f"\n[red]❌ Login failed: {error}[/red]\n")
+
+
+def git_status():
+    """Run `alfred git-status`"""
+    try:
+        # NUL-separated porcelain output: stable, and paths are never quoted
+        records = run_git_bytes('status', '--porcelain=v1', '-z').split(b'\0')
+        
+        if not any(records):
+            console.print("\n[green]✅ Working tree clean[/green]\n")
+            return
+        
+        # Parse status
+        staged = []
+        unstaged = []
+        untracked = []
+        
+        records = iter(records)
+        for record in records:
+            if not record:
+                continue
+            status = record[:2].decode('ascii', errors='replace')
+            filename = record[3:].decode('utf-8', errors='replace')
+            
+            # Renames and copies are followed by the original path
+            if status[0] in 'RC':
+                next(records, None)
+            
+            if status[0] != ' ' and status[0] != '?':
+                staged.append(filename)
+            if status[1] != ' ' and status[1] != '?':
+                unstaged.append(filename)
+            if status == '??':
+                untracked.append(filename)
+        
+        # Build the report and print it in one go
+        lines = ["\n[bold cyan]📊 Git Status[/bold cyan]\n"]
+        if staged:
+            lines.append(f"[green]Staged changes:[/green] {len(staged)} files")
+            for f in staged[:5]:
+                lines.append(f"  [green]✓[/green] {f}")
+            if len(staged) > 5:
+                lines.append(f"  [dim]... and {len(staged) - 5} more[/dim]")
+            lines.append("")
+        
+        if unstaged:
+            lines.append(f"[yellow]Unstaged changes:[/yellow] {len(unstaged)} files")
+            for f in unstaged[:5]:
+                lines.append(f"  [yellow]M[/yellow] {f}")
+            if len(unstaged) > 5:
+                lines.append(f"  [dim]... and {len(unstaged) - 5} more[/dim]")
+            lines.append("")
+        
+        if untracked:
+            lines.append(f"[dim]Untracked files:[/dim] {len(untracked)} files")
+            lines.append("")
+        
+        # Suggest commands
+        lines.append("[bold]💡 Review suggestions:[/bold]")
+        if staged:
+            lines.append("  [cyan]alfred review-git[/cyan]                # Review staged changes")
+        if unstaged:
+            lines.append("  [cyan]alfred review-git --unstaged[/cyan]    # Review unstaged changes")
+        lines.append("  [cyan]alfred review-git --since main[/cyan]    # Review all changes since main")
+        lines.append("")
+        console.print("\n".join(lines))
+        
+    except subprocess.CalledProcessError:
+        console.print("\n[red]❌ Not a git repository[/red]\n")
+        raise typer.Exit(code=1)
+    except FileNotFoundError:
+        console.print("\n[red]❌ Git is not installed[/red]\n")
+        raise typer.Exit(code=1)
+
+
+def github_status():
+    """Run `alfred github-status`"""
+    from .github_auth import get_github_auth
+    github_auth = get_github_auth()
+
+    console.print("\n[bold cyan]GitHub Status[/bold cyan]\n")
+
+    session = github_auth.load_session()
+    if session is None:
+        console.print("[yellow]Not logged in[/yellow]")
+        console.print("\n[dim]Run:[/dim] [cyan]alfred github-login[/cyan]\n")
+        return
+
+    user_info = github_auth.get_user_info(session)
+    token_info = github_auth.get_token_info(session)
+
+    if user_info:
+        console.print(f"[green]✅ Logged in[/green]")
+        console.print(f"\n[bold]User:[/bold] {user_info.get('login')}")
+        console.print(f"[bold]Name:[/bold] {user_info.get('name', 'N/A')}")
+
+    if token_info:
+        hours_left = token_info.get('hours_until_expiry')
+        console.print(f"\n[bold]Token expires in:[/bold] {hours_left} hours")
+
+    console.print()
+
+
+def github_logout():
+    """Run `alfred github-logout`"""
+    from .github_auth import get_github_auth
+    github_auth = get_github_auth()
+
+    session = github_auth.load_session()
+    if session is None:
+        console.print("\n[yellow]Not logged in[/yellow]\n")
+        return
+
+    user_info = github_auth.get_user_info(session)
+    username = user_info.get('login') if user_info else 'Unknown'
+
+    console.print(f"\n[yellow]Logged in as:[/yellow] [cyan]{username}[/cyan]")
+
+    confirm = Confirm.ask("Are you sure you want to logout?", default=False)
+
+    if confirm:
+        github_auth.logout()
+        console.print("\n[green]✅ Logged out successfully[/green]\n")
+    else:
+        console.print("\n[yellow]Logout cancelled[/yellow]\n")
+
+
+def _resolve_pr(pr_url_or_number: str, gh) -> tuple[str, str, int]:
+    """
+    Turn a PR URL or bare PR number into (owner, repo, number)
+    
+    A bare number is looked up in the current repository's origin remote.
+    
+    Args:
+        pr_url_or_number: GitHub PR URL or PR number
+        gh: GitHubIntegration used to parse URLs
+        
+    Returns:
+        Tuple of (owner, repo, pr_number)
+        
+    Raises:
+        ValueError: If the argument can't be resolved to a PR
+    """
+    if pr_url_or_number.startswith('http'):
+        return gh.parse_pr_url(pr_url_or_number)
+    
+    if not pr_url_or_number.isdigit():
+        raise ValueError("Invalid PR URL or number")
+    
+    # Infer repo from git
+    remote = _infer_repo()
+    if not remote:
+        raise ValueError("Could not determine repository. Use full PR URL.")
+    
+    owner, repo = remote
+    return owner, repo, int(pr_url_or_number)
+
+
+def review_pr(
+    pr_url_or_number: str,
+    comment: bool,
+    focus: Focus,
+    api_key: Optional[str],
+    show_cost: bool,
+    verbose: bool
+):
+    """Run `alfred review-pr`"""
+
+    if verbose:
+        print_banner()
+
+    # Check API key
+    config = get_config()
+    anthropic_key = config.get_api_key(api_key)
+
+    if not anthropic_key:
+        console.print("[red]❌ Anthropic API key required. Run 'alfred setup'[/red]")
+        raise typer.Exit(code=1)
+
+    # Check GitHub auth
+    from .github_auth import get_github_auth
+    github_auth = get_github_auth()
+
+    session = github_auth.load_session()
+    if session is None:
+        console.print("\n[red]❌ Not logged in to GitHub[/red]")
+        console.print("\n[cyan]Please login first:[/cyan]")
+        console.print("  alfred github-login\n")
+        raise typer.Exit(code=1)
+
+    from .agent import CodeReviewAgent
+    
+    try:
+        from .github_integration import GitHubIntegration
+        from .prompts import MAX_PR_DIFF_CHARS
+        gh = GitHubIntegration(github_token=session.get('access_token'))
+        
+        # Work out which PR before any network calls
+        try:
+            owner, repo, pr_number = _resolve_pr(pr_url_or_number, gh)
+        except ValueError as e:
+            console.print(f"[red]❌ {str(e)}[/red]")
+            raise typer.Exit(code=1)
+        
+        # The account lookup is independent of the PR, so it runs alongside the fetch
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            user_future = pool.submit(github_auth.get_user_info, session)
+            with spinner("Fetching PR..."):
+                pr, pr_info, _ = gh.get_pr_bundle(owner, repo, pr_number)
+                diff = gh.get_pr_diff(pr, max_size=MAX_PR_DIFF_CHARS)  # Only what the prompt keeps
+            user_info = user_future.result()
+        
+        username = user_info.get('login') if user_info else 'Unknown'
+        console.print(f"\n[dim]Using GitHub account:[/dim] [cyan]{username}[/cyan]")
+        
+        # Show PR info
+        console.print(f"\n📄 PR #{pr_info['number']}: [cyan]{pr_info['title']}[/cyan]")
+        console.print(f"📊 Changes: [green]+{pr_info['additions']}[/green] [red]-{pr_info['deletions']}[/red]\n")
+        
+        # Review, streaming into a live panel
+        agent = CodeReviewAgent(api_key=anthropic_key, track_cost=show_cost)
+        console.print(HRULE)
+        with live_review("📋 PR Review", "*🤖 Reviewing...*") as on_text:
+            review_text, cost_info = agent.review_pr_diff(pr_info, diff, focus, track_cost=show_cost, on_text=on_text)
+            on_text(review_text)
+        
+        if show_cost and cost_info:
+            console.print(f"\n💰 Cost: [yellow]${cost_info['cost']:.4f}[/yellow]")
+        
+        # Post comment
+        if comment:
+            console.print("\n📝 Posting...\n")
+            formatted = gh.format_review_for_pr(review_text, pr_info)
+            try:
+                gh.post_pr_comment(pr, formatted)
+                console.print(f"[green]✅ Posted to PR #{pr_number}![/green]\n")
+            except Exception as e:
+                console.print(f"[red]❌ Failed: {str(e)}[/red]\n")
+        
+        console.print("\n[green]✅ Done![/green]\n")
+        
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]❌ Error: {str(e)}[/red]")
+        if verbose:
+            import traceback
+            console.print("\n[dim]" + traceback.format_exc() + "[/dim]")
+        raise typer.Exit(code=1)
@@ -3,21 +3,84 @@ Core code review agent
 """
 
 import anthropic
+import asyncio
 import os
+import stat
+import time
 from pathlib import Path
-from typing import Optional, Dict
-from .prompts import SYSTEM_PROMPT, get_review_prompt, get_pr_review_prompt
-from .config import Config
+from typing import Callable, Optional, Dict
+from . import MODEL
+from .prompts import SYSTEM_PROMPT, PROMPT_VERSION, get_review_prompt, get_pr_review_prompt
+from .config import get_config
+from .focus import Focus
 from .cost_tracker import CostTracker
+from .http_client import get_http_client
+from .llm_cache import LLMCache
+
+
+# Largest prompt we'll send (Claude's context window is 200k tokens)
+MAX_INPUT_TOKENS = 180_000
+
+# Rough characters-per-token ratio for source code
+CHARS_PER_TOKEN = 3.5
+
+# Bytes 0x80-0xBF only continue a multi-byte UTF-8 character
+UTF8_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+# review_multiple switches to the (half-price) Message Batches API at this many files
+BATCH_THRESHOLD = 5
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text locally, without an API call"""
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+def estimate_request_cost(user_prompt: str, max_tokens: int = 4000) -> float:
+    """Upper-bound cost estimate for a review request (assumes max_tokens output)"""
+    input_tokens = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(user_prompt)
+    return CostTracker.estimate_cost(input_tokens, max_tokens)
+
+
+class PromptTooLargeError(ValueError):
+    """Raised when a prompt exceeds MAX_INPUT_TOKENS"""
+    
+    def __init__(self, tokens: int, limit: int = MAX_INPUT_TOKENS):
+        self.tokens = tokens
+        self.limit = limit
+        super().__init__(
+            f"Input is too large to review: ~{tokens:,} tokens "
+            f"(limit {limit:,}). Review a smaller file or split it up."
+        )
+
+
+class BudgetExceededError(Exception):
+    """Raised when a multi-file review spends past its budget"""
+    
+    def __init__(self, spent: float, budget: float, completed: Dict[str, str], cancelled: list[str]):
+        self.spent = spent
+        self.budget = budget
+        self.completed = completed
+        self.cancelled = cancelled
+        super().__init__(
+            f"Review budget exceeded: spent ${spent:.4f} of ${budget:.4f}. "
+            f"{len(completed)} file(s) reviewed, {len(cancelled)} cancelled."
+        )
 
 
 class CodeReviewAgent:
     """AI agent that reviews code using Claude"""
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize the agent with Anthropic API"""
+    def __init__(self, api_key: Optional[str] = None, track_cost: bool = True):
+        """
+        Initialize the agent with Anthropic API
+        
+        Args:
+            api_key: Anthropic API key (falls back to config/env)
+            track_cost: Whether to record costs; False skips the cost tracker entirely
+        """
         # Use config system to get API key
-        config = Config()
+        config = get_config()
         self.api_key = config.get_api_key(api_key)
         
         if not self.api_key:
@@ -25,33 +88,47 @@ class CodeReviewAgent:
                 "API key not found. Run 'alfred setup' to configure."
             )
         
-        self.client = anthropic.Anthropic(api_key=self.api_key)
-        self.model = "claude-sonnet-4-20250514"
-        self.cost_tracker = CostTracker(config.config_dir)
+        self.client = anthropic.Anthropic(api_key=self.api_key, http_client=get_http_client())
+        self.async_client = anthropic.AsyncAnthropic(api_key=self.api_key)
+        self.model = MODEL
+        self.cost_tracker = CostTracker(config.config_dir) if track_cost else None
+        self.cache = LLMCache(config.config_dir)
     
     def read_file(self, filepath: str) -> str:
         """Read code file from disk"""
         path = Path(filepath)
         
-        if not path.exists():
+        # One stat answers exists, is-a-file and size
+        try:
+            st = path.stat()
+        except FileNotFoundError:
             raise FileNotFoundError(f"File not found: {filepath}")
         
-        if not path.is_file():
+        if not stat.S_ISREG(st.st_mode):
             raise ValueError(f"Path is not a file: {filepath}")
         
-        # Read with error handling for encoding issues
+        # Reject oversize files before reading and decoding them
+        self._check_file_size(path, st.st_size)
+        
+        # Read once into a buffer sized from the stat, then decode from it
+        with open(path, 'rb', buffering=0) as f:
+            data = f.read(st.st_size + 1)
+            if len(data) != st.st_size:
+                data += f.read()  # Changed since the stat; pick up the rest
         try:
-            return path.read_text(encoding='utf-8')
+            return data.decode('utf-8')
         except UnicodeDecodeError:
             # Try with latin-1 as fallback
-            return path.read_text(encoding='latin-1')
+            return data.decode('latin-1')
     
     def review_code(
         self, 
         filepath: str, 
-        focus: str = "general",
+        focus: Focus = Focus.GENERAL,
         max_tokens: int = 4000,
-        track_cost: bool = True
+        track_cost: bool = True,
+        use_cache: bool = True,
+        on_text: Optional[Callable[[str], None]] = None
     ) -> tuple[str, Optional[Dict]]:
         """
         Review a code file
@@ -61,6 +138,8 @@ class CodeReviewAgent:
             focus: Review focus area (general, security, performance, style, bugs)
             max_tokens: Maximum tokens for response
             track_cost: Whether to track and return cost information
+            use_cache: Whether to reuse a cached review of identical code
+            on_text: Called with the review text so far as it streams in
             
         Returns:
             Tuple of (review text, cost info dict or None)
@@ -69,11 +148,49 @@ class CodeReviewAgent:
         code = self.read_file(filepath)
         filename = Path(filepath).name
         
+        # Serve unchanged code from the response cache
+        cache_key = self._review_cache_key(code, filename, focus, max_tokens)
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached:
+                cost_info = self._cached_cost_info() if track_cost else None
+                return cached["text"], cost_info
+        
         # Generate review prompt
         user_prompt = get_review_prompt(code, filename, focus)
+        self._check_prompt_size(user_prompt)
+        
+        # Call Claude, streaming text as it is generated
+        review_text, message = self._stream_review(user_prompt, max_tokens, on_text)
+
+        cost_info = None
+        if track_cost and self.cost_tracker is not None:
+            cost_info = self.cost_tracker.track_review(message.usage, filepath)
+        
+        if use_cache:
+            self._cache_review(cache_key, review_text, message.usage)
+        
+        return review_text, cost_info
+    
+    def _stream_review(
+        self,
+        user_prompt: str,
+        max_tokens: int,
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> tuple:
+        """
+        Send a review prompt, streaming the response
         
-        # Call Claude
-        message = self.client.messages.create(
+        Args:
+            user_prompt: Review prompt
+            max_tokens: Maximum tokens for response
+            on_text: Called with the review text so far as it streams in
+            
+        Returns:
+            Tuple of (review text, final message with usage)
+        """
+        review_text = ""
+        with self.client.messages.stream(
             model=self.model,
             max_tokens=max_tokens,
             system=SYSTEM_PROMPT,
@@ -83,24 +200,92 @@ class CodeReviewAgent:
                     "content": user_prompt
                 }
             ]
-        )
-
-        cost_info = None
-        if track_cost:
-            cost_info = self.cost_tracker.track_review(message.usage, filepath)
+        ) as stream:
+            for text in stream.text_stream:
+                review_text += text
+                if on_text:
+                    on_text(review_text)
+            
+            # Final message still carries usage for cost tracking
+            message = stream.get_final_message()
         
-        # Extract response
-        review_text = message.content[0].text
+        return review_text, message
+    
+    def _check_file_size(self, path: Path, size: int):
+        """
+        Fail fast on files too large to review, without decoding them
         
-        return review_text, cost_info
+        The byte size is an upper bound on the character count, so most
+        files pass on a stat alone. Larger ones have their UTF-8 characters
+        counted in fixed-size chunks instead of being read whole.
+        
+        Args:
+            path: File to check
+            size: File size in bytes, from an earlier stat
+            
+        Raises:
+            PromptTooLargeError: If the file alone exceeds MAX_INPUT_TOKENS
+        """
+        if size / CHARS_PER_TOKEN <= MAX_INPUT_TOKENS:
+            return
+        
+        chars = 0
+        with open(path, 'rb') as f:
+            while chunk := f.read(1024 * 1024):
+                # Every character has exactly one non-continuation byte
+                chars += len(chunk.translate(None, UTF8_CONTINUATION_BYTES))
+        
+        tokens = int(chars / CHARS_PER_TOKEN) + 1
+        if tokens > MAX_INPUT_TOKENS:
+            raise PromptTooLargeError(tokens)
+    
+    def _check_prompt_size(self, user_prompt: str):
+        """Fail fast before sending a prompt that can't fit in context"""
+        tokens = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(user_prompt)
+        if tokens > MAX_INPUT_TOKENS:
+            raise PromptTooLargeError(tokens)
+    
+    def _review_cache_key(self, code: str, filename: str, focus: Focus, max_tokens: int) -> str:
+        """Cache key covering everything that shapes a file review"""
+        return self.cache.cache_key(
+            model=self.model,
+            focus=focus,
+            max_tokens=max_tokens,
+            prompt_v=PROMPT_VERSION,
+            filename=filename,
+            code=code
+        )
+    
+    def _cache_review(self, cache_key: str, review_text: str, usage):
+        """Store a fresh review in the response cache"""
+        self.cache.set(cache_key, {
+            "text": review_text,
+            "usage": {
+                "input_tokens": usage.input_tokens,
+                "output_tokens": usage.output_tokens
+            }
+        })
+    
+    def _cached_cost_info(self) -> Dict:
+        """Cost info for a review served from cache (no API usage)"""
+        return {
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "total_tokens": 0,
+            "cost": 0.0,
+            "input_cost": 0.0,
+            "output_cost": 0.0,
+            "cached": True
+        }
     
     def review_pr_diff(
         self,
         pr_info: Dict,
         diff: str,
-        focus: str = "general",
+        focus: Focus = Focus.GENERAL,
         max_tokens: int = 8000,
-        track_cost: bool = True
+        track_cost: bool = True,
+        on_text: Optional[Callable[[str], None]] = None
     ) -> tuple[str, Optional[Dict]]:
         """
         Review a Pull Request diff
@@ -111,6 +296,7 @@ class CodeReviewAgent:
             focus: Review focus area
             max_tokens: Maximum tokens for response
             track_cost: Whether to track costs
+            on_text: Called with the review text so far as it streams in
             
         Returns:
             Tuple of (review text, cost info dict or None)
@@ -118,49 +304,235 @@ class CodeReviewAgent:
         # Generate PR review prompt
         user_prompt = get_pr_review_prompt(pr_info, diff, focus)
         
-        # Call Claude
-        message = self.client.messages.create(
-            model=self.model,
-            max_tokens=max_tokens,
-            system=SYSTEM_PROMPT,
-            messages=[
-                {
-                    "role": "user",
-                    "content": user_prompt
-                }
-            ]
-        )
+        # Call Claude, streaming text as it is generated
+        review_text, message = self._stream_review(user_prompt, max_tokens, on_text)
         
         # Track cost if enabled
         cost_info = None
-        if track_cost:
+        if track_cost and self.cost_tracker is not None:
             pr_identifier = f"PR#{pr_info.get('number', 'unknown')}"
             cost_info = self.cost_tracker.track_review(message.usage, pr_identifier)
         
-        # Extract response
-        review_text = message.content[0].text
-        
         return review_text, cost_info
     
-    def review_multiple(self, filepaths: list[str], focus: str = "general") -> dict[str, str]:
-        """Review multiple files"""
+    def review_multiple(
+        self,
+        filepaths: list[str],
+        focus: Focus = Focus.GENERAL,
+        concurrency: int = 8,
+        budget: Optional[float] = None
+    ) -> dict[str, str]:
+        """
+        Review multiple files
+        
+        Small sets are reviewed concurrently; BATCH_THRESHOLD or more files
+        are submitted as a single Message Batch. A batch can't be stopped
+        part-way, so setting a budget always uses concurrent requests.
+        
+        Args:
+            filepaths: Paths to the code files
+            focus: Review focus area
+            concurrency: Maximum number of in-flight API requests
+            budget: Stop and cancel remaining reviews once this many dollars are spent
+            
+        Returns:
+            Dict mapping filepath to review text (or error message)
+            
+        Raises:
+            BudgetExceededError: If budget is set and spending passes it
+        """
+        if budget is None and len(filepaths) >= BATCH_THRESHOLD:
+            return self.review_batch(filepaths, focus)
+        
+        return asyncio.run(self.review_multiple_async(filepaths, focus, concurrency, budget))
+    
+    def review_batch(
+        self,
+        filepaths: list[str],
+        focus: Focus = Focus.GENERAL,
+        max_tokens: int = 4000
+    ) -> dict[str, str]:
+        """
+        Review multiple files with the Message Batches API
+        
+        Batched requests are billed at half price and processed server-side,
+        but results can take minutes to arrive.
+        
+        Args:
+            filepaths: Paths to the code files
+            focus: Review focus area
+            max_tokens: Maximum tokens per response
+            
+        Returns:
+            Dict mapping filepath to review text (or error message)
+        """
         results = {}
+        pending = {}  # custom_id -> (filepath, cache_key)
+        requests = []
         
-        for filepath in filepaths:
+        for i, filepath in enumerate(filepaths):
             try:
-                review_text, _ = self.review_code(filepath, focus)
-                results[filepath] = review_text
+                code = self.read_file(filepath)
+                filename = Path(filepath).name
+                
+                cache_key = self._review_cache_key(code, filename, focus, max_tokens)
+                cached = self.cache.get(cache_key)
+                if cached:
+                    results[filepath] = cached["text"]
+                    continue
+                
+                user_prompt = get_review_prompt(code, filename, focus)
+                self._check_prompt_size(user_prompt)
             except Exception as e:
                 results[filepath] = f"Error reviewing file: {str(e)}"
+                continue
+            
+            # custom_id must be short and alphanumeric, so map back by index
+            custom_id = f"file-{i}"
+            pending[custom_id] = (filepath, cache_key)
+            requests.append({
+                "custom_id": custom_id,
+                "params": {
+                    "model": self.model,
+                    "max_tokens": max_tokens,
+                    "system": SYSTEM_PROMPT,
+                    "messages": [
+                        {
+                            "role": "user",
+                            "content": user_prompt
+                        }
+                    ]
+                }
+            })
+        
+        if requests:
+            batches = self.client.beta.messages.batches
+            batch = batches.create(requests=requests)
+            self._wait_for_batch(batch.id)
+            
+            for entry in batches.results(batch.id):
+                filepath, cache_key = pending[entry.custom_id]
+                
+                if entry.result.type != "succeeded":
+                    results[filepath] = f"Error reviewing file: batch request {entry.result.type}"
+                    continue
+                
+                message = entry.result.message
+                if self.cost_tracker is not None:
+                    self.cost_tracker.track_review(message.usage, filepath, batch=True)
+                
+                review_text = message.content[0].text
+                self._cache_review(cache_key, review_text, message.usage)
+                results[filepath] = review_text
         
-        return results
+        return {
+            filepath: results.get(filepath, "Error reviewing file: no result returned")
+            for filepath in filepaths
+        }
+    
+    def _wait_for_batch(self, batch_id: str, initial_delay: float = 2.0, max_delay: float = 60.0):
+        """Poll a message batch with exponential backoff until it has ended"""
+        delay = initial_delay
+        
+        while True:
+            batch = self.client.beta.messages.batches.retrieve(batch_id)
+            if batch.processing_status == "ended":
+                return batch
+            
+            time.sleep(delay)
+            delay = min(delay * 2, max_delay)
+    
+    async def review_multiple_async(
+        self,
+        filepaths: list[str],
+        focus: Focus = Focus.GENERAL,
+        concurrency: int = 8,
+        budget: Optional[float] = None
+    ) -> dict[str, str]:
+        """Async version of review_multiple"""
+        sem = asyncio.Semaphore(concurrency)
+        tasks = {
+            asyncio.ensure_future(self._review_one(sem, filepath, focus)): filepath
+            for filepath in filepaths
+        }
+        
+        results = {}
+        spent = 0.0
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            
+            for task in done:
+                filepath = tasks[task]
+                if task.exception() is not None:
+                    results[filepath] = f"Error reviewing file: {str(task.exception())}"
+                    continue
+                
+                review_text, cost = task.result()
+                results[filepath] = review_text
+                spent += cost
+            
+            if budget is not None and spent > budget and pending:
+                # Cancel queued and in-flight reviews so we stop spending
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                
+                cancelled = [fp for fp in filepaths if fp not in results]
+                completed = {fp: results[fp] for fp in filepaths if fp in results}
+                raise BudgetExceededError(spent, budget, completed, cancelled)
+        
+        return {filepath: results[filepath] for filepath in filepaths}
+    
+    async def _review_one(
+        self,
+        sem: asyncio.Semaphore,
+        filepath: str,
+        focus: Focus,
+        max_tokens: int = 4000
+    ) -> tuple[str, float]:
+        """Review a single file on the async client, bounded by sem"""
+        async with sem:
+            code = await asyncio.to_thread(self.read_file, filepath)
+            filename = Path(filepath).name
+            
+            cache_key = self._review_cache_key(code, filename, focus, max_tokens)
+            cached = self.cache.get(cache_key)
+            if cached:
+                return cached["text"], 0.0
+            
+            user_prompt = get_review_prompt(code, filename, focus)
+            self._check_prompt_size(user_prompt)
+            
+            message = await self.async_client.messages.create(
+                model=self.model,
+                max_tokens=max_tokens,
+                system=SYSTEM_PROMPT,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": user_prompt
+                    }
+                ]
+            )
+        
+        if self.cost_tracker is not None:
+            cost = self.cost_tracker.track_review(message.usage, filepath)['cost']
+        else:
+            cost = CostTracker.estimate_cost(message.usage.input_tokens, message.usage.output_tokens)
+        
+        review_text = message.content[0].text
+        self._cache_review(cache_key, review_text, message.usage)
+        
+        return review_text, cost
     
     def review_git_diff(
         self,
         diff: str,
-        focus: str = "general",
+        focus: Focus = Focus.GENERAL,
         max_tokens: int = 4000,
-        track_cost: bool = True
+        track_cost: bool = True,
+        on_text: Optional[Callable[[str], None]] = None
     ) -> tuple[str, Optional[Dict]]:
         """
         Review git diff (staged or unstaged changes)
@@ -170,6 +542,7 @@ class CodeReviewAgent:
             focus: Review focus area
             max_tokens: Maximum tokens for response
             track_cost: Whether to track costs
+            on_text: Called with the review text so far as it streams in
             
         Returns:
             Tuple of (review text, cost info dict or None)
@@ -179,25 +552,12 @@ class CodeReviewAgent:
         # Generate git diff review prompt
         user_prompt = get_git_diff_review_prompt(diff, focus)
         
-        # Call Claude
-        message = self.client.messages.create(
-            model=self.model,
-            max_tokens=max_tokens,
-            system=SYSTEM_PROMPT,
-            messages=[
-                {
-                    "role": "user",
-                    "content": user_prompt
-                }
-            ]
-        )
+        # Call Claude, streaming text as it is generated
+        review_text, message = self._stream_review(user_prompt, max_tokens, on_text)
         
         # Track cost if enabled
         cost_info = None
-        if track_cost:
+        if track_cost and self.cost_tracker is not None:
             cost_info = self.cost_tracker.track_review(message.usage, "git-diff")
         
-        # Extract response
-        review_text = message.content[0].text
-        
         return review_text, cost_info
\ No newline at end of file
@@ -4,11 +4,14 @@ Fetches actual remaining credits from Anthropic
 """
 
 import anthropic
+from bisect import bisect_left
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional
-from .config import Config
+from typing import Dict, List, Optional, Tuple
+from . import storage
+from .config import get_config
 from .cost_tracker import CostTracker
+from .http_client import get_http_client
 
 
 class APIBalanceTracker:
@@ -23,12 +26,19 @@ class APIBalanceTracker:
             api_key: Anthropic API key
         """
         self.config_dir = config_dir
-        config = Config()
+        config = get_config()
         self.api_key = config.get_api_key(api_key)
         self.cost_tracker = CostTracker(config_dir)
         
+        # Cost history as parallel (ts, cost_micro) columns, reused until the file changes
+        self._columns_cache: Tuple[List[int], List[int]] = ([], [])
+        self._history_mtime: Optional[int] = None
+        
+        # Result of get_detailed_status until invalidate() is called
+        self._status_cache: Optional[Dict] = None
+        
         if self.api_key:
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+            self.client = anthropic.Anthropic(api_key=self.api_key, http_client=get_http_client())
         else:
             self.client = None
     
@@ -57,12 +67,10 @@ class APIBalanceTracker:
         Returns:
             Dict with usage info
         """
-        # Get this month's spending
-        month_cost = self._get_current_month_cost()
-        
-        # Get total all-time spending
-        total_usage = self.cost_tracker.get_total_usage()
-        total_cost = total_usage['total_cost']
+        # This month's and all-time spending in one pass
+        totals = self._get_usage_totals()
+        month_cost = totals['month_cost']
+        total_cost = totals['total_cost']
         
         if user_balance is None:
             # No balance set - just show usage
@@ -77,7 +85,7 @@ class APIBalanceTracker:
         remaining = user_balance
         
         # Estimate if we have enough for more reviews
-        avg_cost_per_review = total_usage.get('avg_cost_per_review', 0.15)
+        avg_cost_per_review = totals['avg_cost_per_review']
         estimated_reviews_left = int(remaining / avg_cost_per_review) if avg_cost_per_review > 0 else 0
         
         # Determine status
@@ -105,13 +113,62 @@ class APIBalanceTracker:
     
     def _get_current_month_cost(self) -> float:
         """Get spending for current calendar month"""
-        history = self.cost_tracker._load_history()
-        current_month = datetime.now().strftime("%Y-%m")
-        month_reviews = [
-            r for r in history 
-            if r['timestamp'].startswith(current_month)
-        ]
-        return sum(r['cost'] for r in month_reviews)
+        return self._get_usage_totals()['month_cost']
+    
+    def _get_usage_totals(self) -> Dict:
+        """Compute all-time cost, this month's cost and average cost"""
+        now = datetime.now()
+        month_start = int(datetime(now.year, now.month, 1).timestamp())
+        
+        timestamps, costs = self._columns()
+        
+        # Columns are sorted by time, so this month is a suffix of the list
+        first_in_month = bisect_left(timestamps, month_start)
+        month_cost = sum(costs[first_in_month:]) / 1_000_000
+        
+        # All-time figures come from the cost totals sidecar, so they match
+        # 'alfred costs --total' without summing the history a second time
+        usage = self.cost_tracker.get_total_usage()
+        total_cost = usage['total_cost']
+        count = usage['total_reviews']
+        
+        return {
+            'total_cost': total_cost,
+            'month_cost': month_cost,
+            'avg_cost_per_review': total_cost / count if count > 0 else 0.15
+        }
+    
+    def _columns(self) -> Tuple[List[int], List[int]]:
+        """
+        Get cost history as (timestamps, costs) columns sorted by time
+        
+        The file is only re-parsed when it has changed.
+        
+        Returns:
+            Tuple of epoch-second timestamps and matching costs in micro-dollars
+        """
+        try:
+            mtime = self.cost_tracker.history_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return [], []
+        
+        if mtime != self._history_mtime:
+            rows = []
+            for r in self.cost_tracker._iter_history():
+                # Records written before 'ts' was added only have the ISO string
+                ts = r.get('ts')
+                if ts is None:
+                    ts = int(datetime.fromisoformat(r['timestamp']).timestamp())
+                rows.append((ts, self.cost_tracker._cost_micro(r)))
+            
+            # History is appended in order; only a clock change can unsort it
+            if any(a[0] > b[0] for a, b in zip(rows, rows[1:])):
+                rows.sort(key=lambda row: row[0])
+            
+            self._columns_cache = ([ts for ts, _ in rows], [cost for _, cost in rows])
+            self._history_mtime = mtime
+        
+        return self._columns_cache
     
     def save_balance(self, balance: float):
         """
@@ -120,19 +177,17 @@ class APIBalanceTracker:
         Args:
             balance: Current balance from Anthropic console
         """
-        import json
-        
         balance_file = self.config_dir / "api_balance.json"
         self.config_dir.mkdir(parents=True, exist_ok=True)
         
         data = {
             'balance': balance,
             'last_updated': datetime.now().isoformat(),
-            'total_cost_at_update': self.cost_tracker.get_total_usage()['total_cost']
+            'total_cost_at_update': self._get_usage_totals()['total_cost']
         }
         
-        with open(balance_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        storage.atomic_write(balance_file, storage.dumps(data))
+        self.invalidate()
     
     def load_balance(self) -> Optional[Dict]:
         """
@@ -141,24 +196,22 @@ class APIBalanceTracker:
         Returns:
             Dict with balance info or None
         """
-        import json
-        
         balance_file = self.config_dir / "api_balance.json"
         
         if not balance_file.exists():
             return None
         
         try:
-            with open(balance_file, 'r') as f:
-                data = json.load(f)
+            data = storage.loads(balance_file.read_bytes())
             
             # Calculate estimated current balance
             saved_balance = data['balance']
             saved_total_cost = data['total_cost_at_update']
-            current_total_cost = self.cost_tracker.get_total_usage()['total_cost']
+            current_total_cost = self._get_usage_totals()['total_cost']
             
-            # Estimated remaining = saved balance - (current cost - saved cost)
-            spent_since_save = current_total_cost - saved_total_cost
+            # Estimated remaining = saved balance - (current cost - saved cost),
+            # taken in micro-dollars so an unchanged history leaves exactly zero
+            spent_since_save = (round(current_total_cost * 1_000_000) - round(saved_total_cost * 1_000_000)) / 1_000_000
             estimated_balance = saved_balance - spent_since_save
             
             return {
@@ -167,16 +220,21 @@ class APIBalanceTracker:
                 'spent_since_update': spent_since_save,
                 'is_estimate': spent_since_save > 0
             }
-        except:
+        except (OSError, storage.JSONDecodeError, KeyError, TypeError):
             return None
     
     def get_detailed_status(self) -> Dict:
         """
         Get detailed status including saved balance
         
+        The result is cached; call invalidate() after recording a review.
+        
         Returns:
             Complete status dict
         """
+        if self._status_cache is not None:
+            return self._status_cache
+        
         balance_data = self.load_balance()
         
         if balance_data:
@@ -185,9 +243,15 @@ class APIBalanceTracker:
             status['last_updated'] = balance_data['last_updated']
             status['is_estimate'] = balance_data.get('is_estimate', False)
             status['spent_since_update'] = balance_data.get('spent_since_update', 0)
-            return status
         else:
-            return self.get_usage_status(None)
+            status = self.get_usage_status(None)
+        
+        self._status_cache = status
+        return status
+    
+    def invalidate(self):
+        """Drop the cached status so the next call re-reads balance and costs"""
+        self._status_cache = None
     
     def check_before_review(self, estimated_cost: float = 0.15) -> tuple[bool, Optional[str]]:
         """
@@ -224,4 +288,17 @@ class APIBalanceTracker:
                 f"   This review will cost ~${estimated_cost:.2f}"
             )
         
-        return True, None
\ No newline at end of file
+        return True, None
+
+
+_shared_tracker: Optional[APIBalanceTracker] = None
+
+
+def get_balance_tracker() -> APIBalanceTracker:
+    """Get the process-wide APIBalanceTracker, creating it on first use"""
+    global _shared_tracker
+    
+    if _shared_tracker is None:
+        _shared_tracker = APIBalanceTracker(get_config().config_dir)
+    
+    return _shared_tracker
@@ -3,10 +3,10 @@ Configuration management for Alfred
 Handles API key storage and retrieval
 """
 
-import json
 import os
 from pathlib import Path
 from typing import Optional
+from . import storage
 
 
 class Config:
@@ -16,6 +16,11 @@ class Config:
         """Initialize config with default paths"""
         self.config_dir = Path.home() / ".alfred"
         self.config_file = self.config_dir / "config.json"
+        
+        # Parsed config.json, reused until the file changes
+        self._config_cache: dict = {}
+        self._config_mtime: Optional[int] = None
+        
         self._ensure_config_dir()
     
     def _ensure_config_dir(self):
@@ -42,7 +47,7 @@ class Config:
             return cli_key
         
         # Priority 2: Config file
-        config_key = self.load_config().get("api_key")
+        config_key = self._load().get("api_key")
         if config_key:
             return config_key
         
@@ -54,23 +59,33 @@ class Config:
         return None
     
     def load_config(self) -> dict:
-        """Load configuration from file"""
-        if not self.config_file.exists():
-            return {}
-        
+        """Load configuration from file (a copy, safe to modify)"""
+        return dict(self._load())
+    
+    def _load(self) -> dict:
+        """Get the parsed config, re-reading the file only when it has changed"""
         try:
-            with open(self.config_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return {}
+            mtime = self.config_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._config_cache = {}
+            self._config_mtime = None
+            return self._config_cache
+        
+        if mtime != self._config_mtime:
+            try:
+                self._config_cache = storage.loads(self.config_file.read_bytes())
+            except (storage.JSONDecodeError, IOError):
+                self._config_cache = {}
+            self._config_mtime = mtime
+        
+        return self._config_cache
     
     def save_config(self, config: dict):
         """Save configuration to file"""
-        with open(self.config_file, 'w') as f:
-            json.dump(config, f, indent=2)
-        
-        # Set permissions to 600 (only user can read/write)
-        self.config_file.chmod(0o600)
+        # Permissions 600 (only user can read/write), set before the rename
+        storage.atomic_write(self.config_file, storage.dumps(config), mode=0o600)
+        self._config_cache = dict(config)
+        self._config_mtime = self.config_file.stat().st_mtime_ns
     
     def save_api_key(self, api_key: str):
         """Save API key to config file"""
@@ -93,6 +108,8 @@ class Config:
         """Clear all configuration"""
         if self.config_file.exists():
             self.config_file.unlink()
+        self._config_cache = {}
+        self._config_mtime = None
     
     def has_api_key(self) -> bool:
         """Check if API key is configured anywhere"""
@@ -100,4 +117,17 @@ class Config:
     
     def get_config_location(self) -> str:
         """Get the config file location"""
-        return str(self.config_file)
\ No newline at end of file
+        return str(self.config_file)
+
+
+_shared_config: Optional[Config] = None
+
+
+def get_config() -> Config:
+    """Get the process-wide Config, creating it on first use"""
+    global _shared_config
+    
+    if _shared_config is None:
+        _shared_config = Config()
+    
+    return _shared_config
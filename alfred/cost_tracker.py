@@ -2,62 +2,98 @@
 Cost tracking for Alfred code reviews
 Tracks token usage and estimates API costs
 """
-import json
+import os
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
+from . import storage
 
 
 class CostTracker:
     """Track API costs and token usage"""
     
-    # Claude Sonnet 4 pricing (per million tokens)
+    # Claude Sonnet 4 pricing (per million tokens, so also micro-dollars per token)
     INPUT_COST_PER_M = 3.00   # $3 per 1M input tokens
     OUTPUT_COST_PER_M = 15.00  # $15 per 1M output tokens
+    BATCH_DISCOUNT = 0.5       # Message Batches are billed at 50%
+    
+    MAX_HISTORY = 1000                  # Reviews kept after trimming
+    ROTATE_AT_RECORDS = 1500            # Trim once the history holds more than this
     
     def __init__(self, config_dir: Path):
         self.config_dir = config_dir
-        self.history_file = config_dir / "cost_history.json"
+        # JSON Lines: one review per line, so saving a review is an append
+        self.history_file = config_dir / "cost_history.jsonl"
+        self.legacy_history_file = config_dir / "cost_history.json"
+        # Running totals over the history (cost in whole micro-dollars), tagged
+        # with the history size they match
+        self.totals_file = config_dir / "cost_totals.json"
+        # Session cost is kept in whole micro-dollars so it adds up exactly
         self.session_usage = {
             "input_tokens": 0,
             "output_tokens": 0,
-            "total_cost": 0.0,
+            "total_cost_micro": 0,
             "reviews": 0
         }
+        self._migrate_legacy_history()
+    
+    @classmethod
+    def estimate_cost(cls, input_tokens: int, output_tokens: int) -> float:
+        """
+        Estimate the cost of a request before sending it
+        
+        Args:
+            input_tokens: Expected prompt tokens
+            output_tokens: Expected (or maximum) response tokens
+            
+        Returns:
+            Estimated cost in dollars
+        """
+        return (
+            (input_tokens / 1_000_000) * cls.INPUT_COST_PER_M +
+            (output_tokens / 1_000_000) * cls.OUTPUT_COST_PER_M
+        )
     
-    def track_review(self, usage, filepath: str = None) -> Dict:
+    def track_review(self, usage, filepath: str = None, batch: bool = False) -> Dict:
         """
         Track a single review's cost
         
         Args:
             usage: Response.usage object from Claude API
             filepath: Optional file that was reviewed
+            batch: Whether the review ran through the Message Batches API
             
         Returns:
             Dict with cost breakdown
         """
         input_tokens = usage.input_tokens
         output_tokens = usage.output_tokens
+        rate = self.BATCH_DISCOUNT if batch else 1.0
         
-        # Calculate costs
-        input_cost = (input_tokens / 1_000_000) * self.INPUT_COST_PER_M
-        output_cost = (output_tokens / 1_000_000) * self.OUTPUT_COST_PER_M
-        total_cost = input_cost + output_cost
+        # Calculate costs in integer micro-dollars, converting to dollars once
+        input_micro = round(input_tokens * self.INPUT_COST_PER_M * rate)
+        output_micro = round(output_tokens * self.OUTPUT_COST_PER_M * rate)
+        input_cost = input_micro / 1_000_000
+        output_cost = output_micro / 1_000_000
+        total_cost = (input_micro + output_micro) / 1_000_000
         
         # Update session totals
         self.session_usage["input_tokens"] += input_tokens
         self.session_usage["output_tokens"] += output_tokens
-        self.session_usage["total_cost"] += total_cost
+        self.session_usage["total_cost_micro"] += input_micro + output_micro
         self.session_usage["reviews"] += 1
         
         # Save to history
+        now = datetime.now()
         review_data = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
+            "ts": int(now.timestamp()),  # Epoch seconds for cheap date filters
             "filepath": filepath,
             "input_tokens": input_tokens,
             "output_tokens": output_tokens,
             "total_tokens": input_tokens + output_tokens,
-            "cost": total_cost
+            "cost": total_cost,
+            "cost_micro": input_micro + output_micro
         }
         self._save_to_history(review_data)
         
@@ -72,14 +108,15 @@ class CostTracker:
     
     def get_session_summary(self) -> Dict:
         """Get summary of current session costs"""
+        total_cost = self.session_usage["total_cost_micro"] / 1_000_000
         return {
             "reviews": self.session_usage["reviews"],
             "total_tokens": self.session_usage["input_tokens"] + self.session_usage["output_tokens"],
             "input_tokens": self.session_usage["input_tokens"],
             "output_tokens": self.session_usage["output_tokens"],
-            "total_cost": self.session_usage["total_cost"],
+            "total_cost": total_cost,
             "avg_cost_per_review": (
-                self.session_usage["total_cost"] / self.session_usage["reviews"]
+                total_cost / self.session_usage["reviews"]
                 if self.session_usage["reviews"] > 0 else 0
             )
         }
@@ -93,11 +130,15 @@ class CostTracker:
                 "total_cost": 0.0
             }
         
-        history = self._load_history()
+        # Served from the sidecar; the history is only scanned if that is stale
+        totals = self._load_totals()
+        if totals is None:
+            totals = self._scan_totals()
+            self._write_totals(totals)
         
-        total_reviews = len(history)
-        total_tokens = sum(r["total_tokens"] for r in history)
-        total_cost = sum(r["cost"] for r in history)
+        total_reviews = totals["reviews"]
+        total_tokens = totals["tokens"]
+        total_cost = totals["cost_micro"] / 1_000_000
         
         return {
             "total_reviews": total_reviews,
@@ -112,29 +153,153 @@ class CostTracker:
         if not self.history_file.exists():
             return []
         
-        history = self._load_history()
-        return history[-limit:]  # Last N reviews
+        # Walk back from the end of the file, parsing only the last N lines
+        recent = []
+        for r in self._iter_history_reversed():
+            if len(recent) >= limit:
+                break
+            recent.append(r)
+        recent.reverse()
+        return recent
     
     def _save_to_history(self, review_data: Dict):
-        """Append review to history file"""
-        history = self._load_history()
-        history.append(review_data)
-        
-        # Keep only last 1000 reviews to avoid file bloat
-        if len(history) > 1000:
-            history = history[-1000:]
+        """Append review to history file and update the running totals"""
+        line = storage.dumps(review_data, indent=False) + b"\n"
         
         self.history_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.history_file, 'w') as f:
-            json.dump(history, f, indent=2)
+        with open(self.history_file, 'ab') as f:
+            f.write(line)
+            f.flush()
+            size = os.fstat(f.fileno()).st_size
+        
+        # Totals are only extended if they matched the file just before this
+        # record; otherwise another process wrote in between, so rescan
+        totals = self._load_totals(history_bytes=size - len(line))
+        if totals is None or self.history_file.stat().st_size != size:
+            totals = self._scan_totals()
+        else:
+            totals["reviews"] += 1
+            totals["tokens"] += review_data["total_tokens"]
+            totals["cost_micro"] += review_data["cost_micro"]
+            totals["history_bytes"] = size
+        
+        # The totals count every record in the file, so they say when to trim
+        # back to the last MAX_HISTORY reviews
+        if totals["reviews"] > self.ROTATE_AT_RECORDS:
+            history = self._load_history()[-self.MAX_HISTORY:]
+            self._write_history(history)
+            totals = self._scan_totals()
+        
+        self._write_totals(totals)
+    
+    def _load_totals(self, history_bytes: Optional[int] = None) -> Optional[Dict]:
+        """
+        Load the running totals, if they still match the history file
+        
+        Any other writer (a second process, a trim, the legacy migration)
+        changes the history size, which makes the sidecar stale.
+        
+        Args:
+            history_bytes: History size the totals must match; defaults to
+                the file's current size
+        
+        Returns:
+            Totals dict, or None if missing or stale
+        """
+        try:
+            size = self.history_file.stat().st_size if history_bytes is None else history_bytes
+            totals = storage.loads(self.totals_file.read_bytes())
+        except (OSError, storage.JSONDecodeError):
+            return None
+        
+        # Sidecars written before cost_micro summed float dollars instead
+        if totals.get("history_bytes") != size or "cost_micro" not in totals:
+            return None
+        return totals
+    
+    def _scan_totals(self) -> Dict:
+        """Rebuild the running totals with a single pass over the history"""
+        try:
+            size = self.history_file.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        
+        totals = {"reviews": 0, "tokens": 0, "cost_micro": 0, "history_bytes": size}
+        for r in self._iter_history():
+            totals["reviews"] += 1
+            totals["tokens"] += r["total_tokens"]
+            totals["cost_micro"] += self._cost_micro(r)
+        return totals
+    
+    @staticmethod
+    def _cost_micro(record: Dict) -> int:
+        """Cost of a history record in whole micro-dollars"""
+        cost_micro = record.get("cost_micro")
+        if cost_micro is None:
+            # Recorded before cost_micro was stored
+            cost_micro = round(record["cost"] * 1_000_000)
+        return cost_micro
+    
+    def _write_totals(self, totals: Dict):
+        """Save the running totals sidecar"""
+        storage.atomic_write(self.totals_file, storage.dumps(totals, indent=False))
+    
+    def _write_history(self, history: List[Dict]):
+        """Rewrite the whole history file"""
+        data = b"".join(storage.dumps(r, indent=False) + b"\n" for r in history)
+        storage.atomic_write(self.history_file, data)
     
     def _load_history(self) -> List[Dict]:
         """Load review history from file"""
-        if not self.history_file.exists():
-            return []
+        return list(self._iter_history())
+    
+    def _iter_history(self) -> Iterator[Dict]:
+        """Stream review records from the history file"""
+        try:
+            with open(self.history_file, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield storage.loads(line)
+                    except storage.JSONDecodeError:
+                        continue  # Skip a torn or corrupt line
+        except (FileNotFoundError, IOError):
+            return
+    
+    def _iter_history_reversed(self) -> Iterator[Dict]:
+        """Stream review records from the history file, newest first"""
+        import mmap
         
         try:
-            with open(self.history_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return []
\ No newline at end of file
+            with open(self.history_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    end = len(mm)
+                    while end > 0:
+                        start = mm.rfind(b"\n", 0, end - 1) + 1
+                        line = mm[start:end]
+                        end = start
+                        if not line.strip():
+                            continue
+                        try:
+                            yield storage.loads(line)
+                        except storage.JSONDecodeError:
+                            continue  # Skip a torn or corrupt line
+        except (FileNotFoundError, IOError):
+            return
+    
+    def _migrate_legacy_history(self):
+        """Convert cost_history.json (one JSON array) to JSON Lines"""
+        if not self.legacy_history_file.exists():
+            return
+        
+        if not self.history_file.exists():
+            try:
+                history = storage.loads(self.legacy_history_file.read_bytes())
+            except (storage.JSONDecodeError, IOError):
+                history = []
+            self._write_history(history)
+        
+        self.legacy_history_file.unlink()
@@ -0,0 +1,32 @@
+"""
+Review focus areas
+"""
+
+from enum import Enum
+
+
+class Focus(str, Enum):
+    """Area a review concentrates on"""
+
+    GENERAL = "general"
+    SECURITY = "security"
+    PERFORMANCE = "performance"
+    STYLE = "style"
+    BUGS = "bugs"
+
+    def __str__(self) -> str:
+        return self.value
+
+    @property
+    def emoji(self) -> str:
+        """Emoji shown next to this focus area"""
+        return _EMOJIS[self]
+
+
+_EMOJIS = {
+    Focus.GENERAL: "🔍",
+    Focus.SECURITY: "🔒",
+    Focus.PERFORMANCE: "⚡",
+    Focus.STYLE: "🎨",
+    Focus.BUGS: "🐛"
+}
@@ -3,13 +3,16 @@ GitHub OAuth authentication for Alfred
 Handles device flow login and token management
 """
 
-import json
+import threading
 import time
-import webbrowser
 from pathlib import Path
-from typing import Optional, Dict
+from typing import TYPE_CHECKING, Optional, Dict
 from datetime import datetime, timedelta
-import requests
+from . import storage
+from .config import get_config
+
+if TYPE_CHECKING:
+    import requests
 
 
 class GitHubAuth:
@@ -21,26 +24,43 @@ class GitHubAuth:
         """Initialize GitHub auth manager"""
         self.config_dir = config_dir
         self.token_file = config_dir / "github_token.json"
+        
+        # Parsed token file and its expiry, reused until the file changes
+        self._token_cache: Optional[Dict] = None
+        self._token_mtime: Optional[int] = None
+        self._expires_epoch: Optional[float] = None
+        
+        self._session: Optional["requests.Session"] = None  # requests is imported on first use
+        
+        # Set by cancel_login() to wake poll_for_token out of its wait;
+        # replaced by each login() so an old cancel can't stop a new flow
+        self._cancel = threading.Event()
     
-    def is_logged_in(self) -> bool:
-        """Check if user has valid token"""
+    def load_session(self) -> Optional[Dict]:
+        """
+        Get the stored token if it is still valid
+        
+        Returns:
+            Parsed token dict, or None if not logged in or expired
+        """
         token_data = self._load_token()
         if not token_data:
-            return False
+            return None
         
-        # Check expiry
-        expires_at = token_data.get('expires_at')
-        if expires_at:
-            if datetime.now() >= datetime.fromisoformat(expires_at):
-                return False
+        # Check expiry (parsed once when the token was loaded)
+        if self._expires_epoch is not None and time.time() >= self._expires_epoch:
+            return None
         
-        return True
+        return token_data
+    
+    def is_logged_in(self) -> bool:
+        """Check if user has valid token"""
+        return self.load_session() is not None
     
     def get_token(self) -> Optional[str]:
         """Get valid GitHub token"""
-        if not self.is_logged_in():
-            return None
-        return self._load_token().get('access_token')
+        token_data = self.load_session()
+        return token_data.get('access_token') if token_data else None
     
     def login(self) -> Dict:
         """
@@ -49,7 +69,9 @@ class GitHubAuth:
         Returns:
             Dict with user_code and verification_uri
         """
-        response = requests.post(
+        self._cancel = threading.Event()
+        
+        response = self._http().post(
             "https://github.com/login/device/code",
             headers={"Accept": "application/json"},
             data={
@@ -75,11 +97,12 @@ class GitHubAuth:
             Dict with success status
         """
         timeout = time.time() + 900  # 15 minute timeout
+        cancel = self._cancel  # A cancel that lands before the first wait still counts
         
-        while time.time() < timeout:
-            time.sleep(interval)
-            
-            response = requests.post(
+        # Poll straight away, then wait between attempts. GitHub answers
+        # slow_down to anything faster than `interval`, so that is the floor.
+        while True:
+            response = self._http().post(
                 "https://github.com/login/oauth/access_token",
                 headers={"Accept": "application/json"},
                 data={
@@ -103,29 +126,50 @@ class GitHubAuth:
                 return {"success": True}
             
             error = data.get('error')
-            if error == 'authorization_pending':
-                continue  # Keep waiting
-            elif error == 'slow_down':
-                interval += 5  # Slow down polling
-                continue
+            if error == 'slow_down':
+                # Use the server's new interval, or add 5s as RFC 8628 says
+                interval = data.get('interval', interval + 5)
             elif error in ['expired_token', 'access_denied']:
                 return {"success": False, "error": error}
+            
+            # Not authorized yet: wait, unless that would run past the timeout
+            if time.time() + interval >= timeout:
+                return {"success": False, "error": "timeout"}
+            if cancel.wait(interval):
+                return {"success": False, "error": "cancelled"}
+    
+    def cancel_login(self):
+        """
+        Stop a poll_for_token running on another thread
         
-        return {"success": False, "error": "timeout"}
+        Its wait wakes at once and it returns error 'cancelled'; a request
+        already in flight finishes first.
+        """
+        self._cancel.set()
     
     def logout(self):
         """Clear stored token"""
         if self.token_file.exists():
             self.token_file.unlink()
+        self._set_token(None, None)
     
-    def get_user_info(self) -> Optional[Dict]:
-        """Get GitHub user info"""
-        token = self.get_token()
+    def get_user_info(self, session: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Get GitHub user info
+        
+        Args:
+            session: Token dict from load_session(), to skip loading it again
+        """
+        if session is None:
+            session = self.load_session()
+        token = session.get('access_token') if session else None
         if not token:
             return None
         
+        import requests
+        
         try:
-            response = requests.get(
+            response = self._http().get(
                 "https://api.github.com/user",
                 headers={
                     "Authorization": f"Bearer {token}",
@@ -133,37 +177,92 @@ class GitHubAuth:
                 }
             )
             return response.json() if response.status_code == 200 else None
-        except:
+        except (requests.RequestException, ValueError):
+            # Network failure, or a body that isn't JSON
             return None
     
-    def get_token_info(self) -> Optional[Dict]:
-        """Get token metadata"""
-        token_data = self._load_token()
-        if not token_data:
+    def get_token_info(self, session: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Get token metadata
+        
+        Args:
+            session: Token dict from load_session(), to skip loading it again
+        """
+        if session is None:
+            session = self.load_session()
+        if not session:
             return None
         
-        expires_at = datetime.fromisoformat(token_data['expires_at'])
-        hours_left = (expires_at - datetime.now()).total_seconds() / 3600
+        expires_at = session.get('expires_at')
+        hours_left = (
+            round((datetime.fromisoformat(expires_at).timestamp() - time.time()) / 3600, 1)
+            if expires_at else None
+        )
         
         return {
-            'scope': token_data.get('scope'),
-            'hours_until_expiry': round(hours_left, 1),
-            'created_at': token_data['created_at']
+            'scope': session.get('scope'),
+            'hours_until_expiry': hours_left,
+            'created_at': session.get('created_at')
         }
     
     def _save_token(self, token_data: Dict):
         """Save token securely"""
         self.config_dir.mkdir(parents=True, exist_ok=True)
-        with open(self.token_file, 'w') as f:
-            json.dump(token_data, f, indent=2)
-        self.token_file.chmod(0o600)  # Only user can read
+        # Only user can read, set before the file is renamed into place
+        storage.atomic_write(self.token_file, storage.dumps(token_data), mode=0o600)
+        self._set_token(token_data, self.token_file.stat().st_mtime_ns)
     
     def _load_token(self) -> Optional[Dict]:
-        """Load token from file"""
-        if not self.token_file.exists():
-            return None
+        """Load token from file, re-reading it only when it has changed"""
         try:
-            with open(self.token_file, 'r') as f:
-                return json.load(f)
-        except:
-            return None
\ No newline at end of file
+            mtime = self.token_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._set_token(None, None)
+            return None
+        
+        if mtime != self._token_mtime:
+            try:
+                token_data = storage.loads(self.token_file.read_bytes())
+            except (OSError, storage.JSONDecodeError):
+                token_data = None
+            self._set_token(token_data, mtime)
+        
+        return self._token_cache
+    
+    def _set_token(self, token_data: Optional[Dict], mtime: Optional[int]):
+        """Cache a parsed token along with its expiry as epoch seconds"""
+        self._token_cache = token_data
+        self._token_mtime = mtime
+        
+        expires_at = token_data.get('expires_at') if token_data else None
+        self._expires_epoch = datetime.fromisoformat(expires_at).timestamp() if expires_at else None
+    
+    def _http(self) -> "requests.Session":
+        """Get the session shared by all GitHub calls, creating it on first use"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            # Keeps the TLS connection to GitHub open across login polls and API calls
+            self._session = requests.Session()
+            self._session.mount("https://", HTTPAdapter(
+                pool_connections=2,
+                pool_maxsize=4,
+                max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+            ))
+        
+        return self._session
+
+
+_shared_auth: Optional[GitHubAuth] = None
+
+
+def get_github_auth() -> GitHubAuth:
+    """Get the process-wide GitHubAuth, creating it on first use"""
+    global _shared_auth
+    
+    if _shared_auth is None:
+        _shared_auth = GitHubAuth(get_config().config_dir)
+    
+    return _shared_auth
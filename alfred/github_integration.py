@@ -5,14 +5,27 @@ Handles PR reviews and commenting
 
 from typing import Optional, Dict, List, Tuple
 from pathlib import Path
+import io
 import re
+import time
 from github import Github, GithubException
 from github.PullRequest import PullRequest
 
 
+_PR_URL_RE = re.compile(r'github\.com/([^/]+)/([^/]+)/pull/(\d+)')
+
+# Closes each file's patch in get_pr_diff
+_FILE_SEPARATOR = "\n\n" + "=" * 80 + "\n"
+
+
 class GitHubIntegration:
     """Handle GitHub API interactions"""
     
+    CACHE_TTL = 60  # Seconds a fetched PR or file list is reused within a run
+    PER_PAGE = 100  # GitHub's maximum page size for list endpoints
+    MAX_FILES = 3000  # GitHub lists at most this many files for a PR
+    PAGE_WORKERS = 8  # File pages fetched at once
+    
     def __init__(self, github_token: Optional[str] = None, github_auth: Optional['GitHubAuth'] = None):
         """
         Initialize GitHub integration
@@ -24,12 +37,23 @@ class GitHubIntegration:
         # Priority: explicit token > auth manager > None
         if github_token:
             self.token = github_token
-        elif github_auth and github_auth.is_logged_in():
-            self.token = github_auth.get_token()
+        elif github_auth:
+            self.token = github_auth.get_token()  # None unless logged in
         else:
             self.token = None
         
-        self.client = Github(self.token) if self.token else None
+        self._client: Optional[Github] = None  # Created on first use
+        
+        # (fetched_at, value) entries: PRs by (owner, repo, pr_number), files by PR API URL
+        self._pr_cache: Dict[Tuple[str, str, int], Tuple[float, PullRequest]] = {}
+        self._files_cache: Dict[str, Tuple[float, List[Dict]]] = {}
+    
+    @property
+    def client(self) -> Optional[Github]:
+        """PyGithub client, or None without a token"""
+        if self._client is None and self.token:
+            self._client = Github(self.token, per_page=self.PER_PAGE, pool_size=self.PAGE_WORKERS)
+        return self._client
     
     def parse_pr_url(self, url: str) -> Tuple[str, str, int]:
         """
@@ -41,8 +65,7 @@ class GitHubIntegration:
         Returns:
             Tuple of (owner, repo, pr_number)
         """
-        pattern = r'github\.com/([^/]+)/([^/]+)/pull/(\d+)'
-        match = re.search(pattern, url)
+        match = _PR_URL_RE.search(url)
         
         if not match:
             raise ValueError(
@@ -53,7 +76,7 @@ class GitHubIntegration:
         owner, repo, pr_number = match.groups()
         return owner, repo, int(pr_number)
     
-    def get_pr(self, owner: str, repo: str, pr_number: int) -> PullRequest:
+    def get_pr(self, owner: str, repo: str, pr_number: int, prefetch_files: bool = False) -> PullRequest:
         """
         Get Pull Request object
         
@@ -61,32 +84,91 @@ class GitHubIntegration:
             owner: Repository owner
             repo: Repository name
             pr_number: PR number
+            prefetch_files: Also load the changed files, requesting the first
+                page while the PR itself loads
             
         Returns:
             PullRequest object
         """
-        if not self.client:
+        if not self.token:
             raise ValueError("GitHub token required. Run 'alfred github-login'")
         
+        key = (owner, repo, pr_number)
+        cached = self._cache_get(self._pr_cache, key)
+        if cached is not None:
+            return cached
+        
         try:
-            repository = self.client.get_repo(f"{owner}/{repo}")
-            return repository.get_pull(pr_number)
+            # Lazy: the repository itself is never fetched, only the PR
+            repository = self.client.get_repo(f"{owner}/{repo}", lazy=True)
+            pr = repository.get_pull(pr_number)
+            if prefetch_files:
+                # Listing files only needs the PR's URL, not its details
+                from concurrent.futures import ThreadPoolExecutor
+                with ThreadPoolExecutor(max_workers=1) as pool:
+                    page_future = pool.submit(pr.get_files().get_page, 0)
+                    pr.raw_data
+                    first_page = page_future.result()
+            else:
+                pr.raw_data  # get_pull is lazy too; fetch now so a bad PR fails here
         except GithubException as e:
             raise ValueError(f"Failed to fetch PR: {e.data.get('message', str(e))}")
+        
+        self._pr_cache[key] = (time.monotonic(), pr)
+        if prefetch_files:
+            self.get_pr_files(pr, first_page=first_page)
+        return pr
+    
+    def get_pr_bundle(self, owner: str, repo: str, pr_number: int) -> Tuple[PullRequest, Dict, List[Dict]]:
+        """
+        Get a PR together with its info and changed files
+        
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            pr_number: PR number
+            
+        Returns:
+            Tuple of (PullRequest, PR info dict, list of file dicts)
+        """
+        pr = self.get_pr(owner, repo, pr_number, prefetch_files=True)
+        return pr, self.get_pr_info(pr), self.get_pr_files(pr)
     
-    def get_pr_files(self, pr: PullRequest) -> List[Dict]:
+    def get_pr_files(self, pr: PullRequest, first_page: Optional[list] = None) -> List[Dict]:
         """
         Get changed files in PR
         
         Args:
             pr: PullRequest object
+            first_page: First page of pr.get_files(), if already fetched
             
         Returns:
             List of dicts with file info
         """
+        key = pr.url
+        cached = self._cache_get(self._files_cache, key)
+        if cached is not None:
+            return cached
+        
+        # The page count is known from the PR, so the pages are fetched side by side
+        # instead of following the pagination links one round trip at a time
+        pages = -(-min(pr.changed_files, self.MAX_FILES) // self.PER_PAGE)
+        paginated = pr.get_files()
+        if first_page is None and pages <= 1:
+            pr_files = paginated
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            from itertools import chain
+            fetched = [] if first_page is None else [first_page]
+            remaining = range(len(fetched), pages)
+            if remaining:
+                with ThreadPoolExecutor(max_workers=min(len(remaining), self.PAGE_WORKERS)) as pool:
+                    fetched.extend(pool.map(paginated.get_page, remaining))
+            pr_files = list(chain.from_iterable(fetched))
+        
         files = []
         
-        for file in pr.get_files():
+        for file in pr_files:
             if file.patch:
                 files.append({
                     'filename': file.filename,
@@ -97,32 +179,60 @@ class GitHubIntegration:
                     'changes': file.changes
                 })
         
+        self._files_cache[key] = (time.monotonic(), files)
         return files
     
-    def get_pr_diff(self, pr: PullRequest) -> str:
+    def get_pr_diff(self, pr: PullRequest, max_size: Optional[int] = None) -> str:
         """
         Get full diff for PR
         
         Args:
             pr: PullRequest object
+            max_size: If set, keep whole files from the start and end of the
+                PR up to about this many characters, and skip the middle
+                without ever building it
             
         Returns:
             Unified diff string
         """
         files = self.get_pr_files(pr)
+        headers = [
+            f"File: {file['filename']}\n"
+            f"Status: {file['status']}\n"
+            f"Changes: +{file['additions']} -{file['deletions']}\n\n"
+            for file in files
+        ]
+        # Each file's length in the diff, counting the newline that joins it to the next
+        sizes = [len(h) + len(f['patch']) + len(_FILE_SEPARATOR) + 1 for h, f in zip(headers, files)]
+        
+        # Which files to write: all of them, or a head and a tail that fit
+        head_end = tail_start = len(files)
+        if max_size is not None and sum(sizes) - 1 > max_size:
+            budget = max_size // 2
+            head_end, used = 1, sizes[0]
+            while head_end < len(files) and used + sizes[head_end] <= budget:
+                used += sizes[head_end]
+                head_end += 1
+            tail_start, used = len(files) - 1, sizes[-1]
+            while tail_start - 1 >= head_end and used + sizes[tail_start - 1] <= budget:
+                tail_start -= 1
+                used += sizes[tail_start]
+            tail_start = max(tail_start, head_end)
+        
+        # Written straight into one buffer rather than joined from fragments
+        buf = io.StringIO()
+        write = buf.write
+        for i in [*range(head_end), *range(tail_start, len(files))]:
+            if i:
+                write("\n")
+            if i == tail_start and tail_start > head_end:
+                omitted = tail_start - head_end
+                write(f"[... {omitted} files omitted, {sum(sizes[head_end:tail_start])} chars ...]\n\n")
+            write(headers[i])
+            write(files[i]['patch'])
+            write(_FILE_SEPARATOR)
         
-        diff_parts = []
-        for file in files:
-            diff_parts.append(f"File: {file['filename']}")
-            diff_parts.append(f"Status: {file['status']}")
-            diff_parts.append(f"Changes: +{file['additions']} -{file['deletions']}")
-            diff_parts.append("")
-            diff_parts.append(file['patch'])
-            diff_parts.append("")
-            diff_parts.append("=" * 80)
-            diff_parts.append("")
-        
-        return "\n".join(diff_parts)
+        return buf.getvalue()
     
     def post_pr_comment(self, pr: PullRequest, comment: str) -> bool:
         """
@@ -174,20 +284,39 @@ class GitHubIntegration:
         Returns:
             Formatted markdown comment
         """
-        comment_parts = [
-            "## 🤖 Alfred AI Code Review",
-            "",
-            f"**PR:** #{pr_info['number']} - {pr_info['title']}",
-            f"**Files changed:** {pr_info['files_changed']}",
-            f"**Changes:** +{pr_info['additions']} -{pr_info['deletions']}",
-            "",
-            "---",
-            "",
-            review,
-            "",
-            "---",
-            "",
+        return (
+            "## 🤖 Alfred AI Code Review\n"
+            "\n"
+            f"**PR:** #{pr_info['number']} - {pr_info['title']}\n"
+            f"**Files changed:** {pr_info['files_changed']}\n"
+            f"**Changes:** +{pr_info['additions']} -{pr_info['deletions']}\n"
+            "\n"
+            "---\n"
+            "\n"
+            f"{review}\n"
+            "\n"
+            "---\n"
+            "\n"
             "*This review was automatically generated by Alfred AI*"
-        ]
+        )
+    
+    def _cache_get(self, cache: Dict, key):
+        """
+        Look up a cached API result
+        
+        Args:
+            cache: One of the per-run caches
+            key: Entry key
+            
+        Returns:
+            Cached value, or None if missing or older than CACHE_TTL
+        """
+        entry = cache.get(key)
+        if entry is None:
+            return None
         
-        return "\n".join(comment_parts)
\ No newline at end of file
+        fetched_at, value = entry
+        if time.monotonic() - fetched_at > self.CACHE_TTL:
+            del cache[key]
+            return None
+        return value
@@ -0,0 +1,27 @@
+"""
+Shared HTTP client for Anthropic API calls
+Keeps one connection pool per process so TCP/TLS setup is paid once
+"""
+
+import atexit
+from typing import Optional
+
+import anthropic
+import httpx
+
+
+_shared_client: Optional[httpx.Client] = None
+
+
+def get_http_client() -> httpx.Client:
+    """Get the process-wide HTTP client, creating it on first use"""
+    global _shared_client
+
+    if _shared_client is None:
+        # DefaultHttpxClient keeps the SDK's default timeouts
+        _shared_client = anthropic.DefaultHttpxClient(
+            limits=httpx.Limits(max_keepalive_connections=16, max_connections=32)
+        )
+        atexit.register(_shared_client.close)
+
+    return _shared_client
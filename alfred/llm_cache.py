@@ -0,0 +1,139 @@
+"""
+Response cache for Alfred reviews
+Stores Claude responses on disk so unchanged code isn't re-reviewed
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from . import storage
+
+
+class LLMCache:
+    """Disk-backed cache of Claude review responses"""
+
+    DEFAULT_TTL = 7 * 24 * 60 * 60  # 7 days
+
+    def __init__(self, config_dir: Path, ttl: int = DEFAULT_TTL):
+        """
+        Initialize response cache
+
+        Args:
+            config_dir: Config directory (e.g., ~/.alfred)
+            ttl: Seconds before a cached response expires
+        """
+        self.cache_dir = config_dir / "cache"
+        self.stats_file = self.cache_dir / "stats.json"
+        self.ttl = ttl
+
+    @staticmethod
+    def cache_key(**parts) -> str:
+        """
+        Build a cache key from everything that affects the response
+
+        Args:
+            **parts: Model, focus, prompt version, code, etc.
+
+        Returns:
+            SHA-256 hex digest
+        """
+        # Stdlib json on purpose: its exact bytes define existing cache keys
+        payload = json.dumps(parts, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Cache key from cache_key()
+
+        Returns:
+            Cached value or None on miss/expiry
+        """
+        entry_file = self._entry_file(key)
+
+        try:
+            entry = storage.loads(entry_file.read_bytes())
+        except (storage.JSONDecodeError, IOError):
+            self._record("misses")
+            return None
+
+        # Drop expired entries
+        if time.time() - entry.get("created_at", 0) > self.ttl:
+            entry_file.unlink(missing_ok=True)
+            self._record("misses")
+            return None
+
+        self._record("hits")
+        return entry.get("value")
+
+    def set(self, key: str, value: Dict):
+        """
+        Store a response in the cache
+
+        Args:
+            key: Cache key from cache_key()
+            value: JSON-serializable response data
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        entry = {
+            "created_at": time.time(),
+            "value": value
+        }
+
+        storage.atomic_write(self._entry_file(key), storage.dumps(entry, indent=False))
+
+    def clear(self) -> int:
+        """
+        Delete all cached responses
+
+        Returns:
+            Number of entries deleted
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        count = 0
+        for entry_file in self.cache_dir.glob("*.json"):
+            if entry_file == self.stats_file:
+                continue
+            entry_file.unlink()
+            count += 1
+
+        self.stats_file.unlink(missing_ok=True)
+        return count
+
+    def get_stats(self) -> Dict:
+        """Get cache hit/miss statistics"""
+        stats = self._load_stats()
+        lookups = stats["hits"] + stats["misses"]
+
+        return {
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "hit_rate": stats["hits"] / lookups if lookups > 0 else 0
+        }
+
+    def _entry_file(self, key: str) -> Path:
+        """Path of the cache entry for a key"""
+        return self.cache_dir / f"{key}.json"
+
+    def _record(self, outcome: str):
+        """Increment the hit or miss counter"""
+        stats = self._load_stats()
+        stats[outcome] += 1
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Atomic, so a concurrent get() never reads a half-written file
+        storage.atomic_write(self.stats_file, storage.dumps(stats, indent=False))
+
+    def _load_stats(self) -> Dict:
+        """Load hit/miss counters from file"""
+        try:
+            return {"hits": 0, "misses": 0, **storage.loads(self.stats_file.read_bytes())}
+        except (storage.JSONDecodeError, IOError):
+            return {"hits": 0, "misses": 0}
@@ -2,6 +2,15 @@
 Code review prompts for different analysis types
 """
 
+from .focus import Focus
+
+# Bump when prompts change so cached responses are invalidated
+PROMPT_VERSION = 1
+
+# Diff characters kept in a prompt; larger diffs keep their start and end
+MAX_PR_DIFF_CHARS = 100000
+MAX_GIT_DIFF_CHARS = 50000  # ~50KB
+
 SYSTEM_PROMPT = """You are an expert code reviewer with deep knowledge of software engineering best practices, security, and performance optimization.
 
 Your reviews should be:
@@ -18,18 +27,112 @@ For each issue found, provide:
 5. Suggested fix with code example
 """
 
-def get_review_prompt(code: str, filename: str, focus: str = "general") -> str:
-    """Generate a review prompt based on focus area"""
+# Focus instructions for file reviews
+FOCUS_PROMPTS: dict[Focus, str] = {
+    Focus.GENERAL: "Review for bugs, code quality, best practices, and potential improvements.",
+    Focus.SECURITY: "Focus on security vulnerabilities, injection risks, authentication issues, and data exposure.",
+    Focus.PERFORMANCE: "Analyze for performance bottlenecks, inefficient algorithms, and resource usage.",
+    Focus.STYLE: "Check code style, naming conventions, documentation, and readability.",
+    Focus.BUGS: "Hunt for logical errors, edge cases, null pointer issues, and runtime errors."
+}
+
+# Focus instructions for pull request reviews
+PR_FOCUS_PROMPTS: dict[Focus, str] = {
+    Focus.GENERAL: "Review for bugs, code quality, best practices, breaking changes, and potential issues.",
+    Focus.SECURITY: "Focus on security vulnerabilities, injection risks, authentication issues, and data exposure in the changes.",
+    Focus.PERFORMANCE: "Analyze the changes for performance impact, inefficient algorithms, and resource usage.",
+    Focus.STYLE: "Check code style consistency, naming conventions, and readability in the changes.",
+    Focus.BUGS: "Hunt for logical errors, edge cases, race conditions, and runtime errors introduced by the changes."
+}
+
+# Focus instructions for git diff reviews
+GIT_DIFF_FOCUS_PROMPTS: dict[Focus, str] = {
+    Focus.GENERAL: "Review for bugs, code quality, breaking changes, and potential issues in the changes.",
+    Focus.SECURITY: "Focus on security implications of these changes: new vulnerabilities, exposed data, auth issues.",
+    Focus.PERFORMANCE: "Analyze performance impact of these changes: new bottlenecks, inefficient code, resource usage.",
+    Focus.STYLE: "Check code style consistency, naming conventions, and readability of the changes.",
+    Focus.BUGS: "Hunt for bugs introduced by these changes: logic errors, edge cases, potential runtime issues."
+}
+
+
+# Room left for the omission marker, so a truncated diff stays within its limit
+_MARKER_RESERVE = 100
+
+# Preferred cut points, so the kept ends start and stop on whole hunks or files
+_DIFF_BOUNDARIES = ("\n@@ ", "\ndiff --git ", "\nFile: ")
+
+
+def truncate_diff_ends(head: str, tail: str, total_size: int, max_size: int) -> str:
+    """
+    Join the start and end of an over-long diff around an omission marker
     
-    focus_instructions = {
-        "general": "Review for bugs, code quality, best practices, and potential improvements.",
-        "security": "Focus on security vulnerabilities, injection risks, authentication issues, and data exposure.",
-        "performance": "Analyze for performance bottlenecks, inefficient algorithms, and resource usage.",
-        "style": "Check code style, naming conventions, documentation, and readability.",
-        "bugs": "Hunt for logical errors, edge cases, null pointer issues, and runtime errors."
-    }
+    Cuts fall on a hunk or file boundary when one keeps at least half of each
+    end, otherwise on a line boundary, and otherwise mid-line.
     
-    instruction = focus_instructions.get(focus, focus_instructions["general"])
+    Args:
+        head: Text from the start of the diff, at least max_size // 2 long
+        tail: Text from the end of the diff, at least max_size // 2 long
+        total_size: Characters in the whole diff
+        max_size: Characters to keep
+        
+    Returns:
+        The head and tail of the diff around an omission marker
+    """
+    if max_size > 2 * _MARKER_RESERVE:
+        half = (max_size - _MARKER_RESERVE) // 2
+    else:
+        half = max_size // 2
+    
+    head_cuts = [head.rfind(sep, 0, half) + 1 for sep in _DIFF_BOUNDARIES]
+    head_end = max(head_cuts)
+    if head_end < half // 2:
+        head_end = head.rfind("\n", 0, half) + 1 or half
+    
+    lo = max(len(tail) - half - 1, 0)
+    tail_cuts = [tail.find(sep, lo) + 1 for sep in _DIFF_BOUNDARIES]
+    tail_cuts = [cut for cut in tail_cuts if cut and len(tail) - cut >= half // 2]
+    if tail_cuts:
+        tail_start = min(tail_cuts)
+    else:
+        tail_start = tail.find("\n", lo) + 1
+        # No line break before the last character: split mid-line instead
+        if not tail_start or tail_start >= len(tail):
+            tail_start = max(len(tail) - half, 0)
+    
+    head, tail = head[:head_end], tail[tail_start:]
+    omitted = total_size - len(head) - len(tail)
+    
+    return (
+        head +
+        f"\n[... {omitted} chars omitted, total size: {total_size} chars ...]\n\n" +
+        tail
+    )
+
+
+def _truncate_diff(diff: str, max_size: int) -> str:
+    """
+    Shorten a diff to about max_size characters, keeping its start and end
+    
+    The middle is dropped on hunk, file or line boundaries, so the last files
+    of a large change are still reviewed instead of being cut off entirely.
+    
+    Args:
+        diff: Diff text
+        max_size: Characters to keep
+        
+    Returns:
+        The diff, or its head and tail around an omission marker
+    """
+    if len(diff) <= max_size:
+        return diff
+    
+    return truncate_diff_ends(diff, diff, len(diff), max_size)
+
+
+def get_review_prompt(code: str, filename: str, focus: Focus = Focus.GENERAL) -> str:
+    """Generate a review prompt based on focus area"""
+    
+    instruction = FOCUS_PROMPTS.get(focus, FOCUS_PROMPTS[Focus.GENERAL])
     
     return f"""Please review this {filename} file.
 
@@ -67,7 +170,7 @@ Provide your review in this format:
 """
 
 
-def get_pr_review_prompt(pr_info: dict, diff: str, focus: str = "general") -> str:
+def get_pr_review_prompt(pr_info: dict, diff: str, focus: Focus = Focus.GENERAL) -> str:
     """
     Generate a review prompt for a Pull Request
     
@@ -79,20 +182,10 @@ def get_pr_review_prompt(pr_info: dict, diff: str, focus: str = "general") -> st
     Returns:
         Formatted prompt string
     """
-    focus_instructions = {
-        "general": "Review for bugs, code quality, best practices, breaking changes, and potential issues.",
-        "security": "Focus on security vulnerabilities, injection risks, authentication issues, and data exposure in the changes.",
-        "performance": "Analyze the changes for performance impact, inefficient algorithms, and resource usage.",
-        "style": "Check code style consistency, naming conventions, and readability in the changes.",
-        "bugs": "Hunt for logical errors, edge cases, race conditions, and runtime errors introduced by the changes."
-    }
-    
-    instruction = focus_instructions.get(focus, focus_instructions["general"])
+    instruction = PR_FOCUS_PROMPTS.get(focus, PR_FOCUS_PROMPTS[Focus.GENERAL])
     
     # Truncate diff if too large
-    max_diff_size = 100000
-    if len(diff) > max_diff_size:
-        diff = diff[:max_diff_size] + f"\n\n[... diff truncated, total size: {len(diff)} chars]"
+    diff = _truncate_diff(diff, MAX_PR_DIFF_CHARS)
     
     return f"""Please review this Pull Request.
 
@@ -146,7 +239,7 @@ Provide your review in this format:
 [Brief explanation of the score]
 """
 
-def get_git_diff_review_prompt(diff: str, focus: str = "general") -> str:
+def get_git_diff_review_prompt(diff: str, focus: Focus = Focus.GENERAL) -> str:
     """
     Generate a review prompt for git diff
     
@@ -157,20 +250,10 @@ def get_git_diff_review_prompt(diff: str, focus: str = "general") -> str:
     Returns:
         Formatted prompt string
     """
-    focus_instructions = {
-        "general": "Review for bugs, code quality, breaking changes, and potential issues in the changes.",
-        "security": "Focus on security implications of these changes: new vulnerabilities, exposed data, auth issues.",
-        "performance": "Analyze performance impact of these changes: new bottlenecks, inefficient code, resource usage.",
-        "style": "Check code style consistency, naming conventions, and readability of the changes.",
-        "bugs": "Hunt for bugs introduced by these changes: logic errors, edge cases, potential runtime issues."
-    }
-    
-    instruction = focus_instructions.get(focus, focus_instructions["general"])
+    instruction = GIT_DIFF_FOCUS_PROMPTS.get(focus, GIT_DIFF_FOCUS_PROMPTS[Focus.GENERAL])
     
     # Truncate diff if too large
-    max_diff_size = 50000  # ~50KB
-    if len(diff) > max_diff_size:
-        diff = diff[:max_diff_size] + f"\n\n[... diff truncated, total size: {len(diff)} chars]"
+    diff = _truncate_diff(diff, MAX_GIT_DIFF_CHARS)
     
     return f"""Please review these git changes.
 
@@ -3,10 +3,41 @@ Review history tracking for Alfred
 Stores and retrieves past code reviews
 """
 
-import json
+import re
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple, TypedDict
+from . import storage
+from .config import get_config
+
+
+# Labelled score formats in order of preference, e.g. "Overall Score: 8/10"
+_SCORE_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'Overall Score:\s*(\d+)/10',
+    r'Score:\s*(\d+)/10',
+    r'Rating:\s*(\d+)/10'
+))
+
+# A bare "8/10"; every labelled format contains one
+_BARE_SCORE_RE = re.compile(r'(\d+)/10')
+
+# Display date stored with each review
+_DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+
+class ReviewRecord(TypedDict):
+    """One saved review, as stored in the history file"""
+    
+    id: int
+    filepath: str
+    filename: str
+    review: str
+    focus: str
+    score: Optional[int]
+    cost: Optional[float]
+    timestamp: str
+    date: str
 
 
 class ReviewHistory:
@@ -20,8 +51,22 @@ class ReviewHistory:
             config_dir: Config directory (e.g., ~/.alfred)
         """
         self.config_dir = config_dir
-        self.history_file = config_dir / "review_history.json"
+        # JSON Lines: one review per line, so saving a review is an append
+        self.history_file = config_dir / "review_history.jsonl"
+        self.legacy_history_file = config_dir / "review_history.json"
+        # Running aggregates for get_stats, tagged with the history size they match
+        self.stats_file = config_dir / "review_stats.json"
         self.max_reviews = 100  # Keep last 100 reviews
+        self.rotate_at = 2 * self.max_reviews  # Trim the file once it holds this many
+        
+        # Parsed history (last max_reviews), reused until the file changes
+        self._history_cache: List[ReviewRecord] = []
+        self._history_mtime: Optional[int] = None
+        self._file_records = 0  # Records in the file, including trimmed-off ones
+        self._id_index: Dict[int, int] = {}  # Review ID -> position in the cached list
+        self._file_index: Dict[str, List[int]] = {}  # Filename or filepath -> positions
+        self._corpus: Optional[Tuple[str, List[int]]] = None  # Lowercased text for search()
+        self._migrate_legacy_history()
     
     def save_review(
         self,
@@ -44,16 +89,17 @@ class ReviewHistory:
         Returns:
             Review ID
         """
-        history = self._load_history()
+        cached = self._load_history()
         
-        # Generate review ID
-        review_id = len(history) + 1
+        # Generate review ID (one past the newest, so IDs stay unique after trims)
+        review_id = cached[-1]['id'] + 1 if cached else 1
         
         # Extract score from review if not provided
         if score is None:
             score = self._extract_score(review_text)
         
-        review_data = {
+        now = datetime.now()  # One clock read, so timestamp and date always agree
+        review_data: ReviewRecord = {
             "id": review_id,
             "filepath": str(filepath),
             "filename": Path(filepath).name,
@@ -61,20 +107,24 @@ class ReviewHistory:
             "focus": focus,
             "score": score,
             "cost": cost,
-            "timestamp": datetime.now().isoformat(),
-            "date": datetime.now().strftime("%Y-%m-%d %H:%M")
+            "timestamp": now.isoformat(),
+            "date": now.strftime(_DATE_FORMAT)
         }
         
+        # Keep only last N reviews, copying just those once and making room
+        # for the new one; the file itself is trimmed once it grows large
+        overflow = len(cached) + 1 - self.max_reviews
+        history = cached[max(overflow, 0):]
         history.append(review_data)
         
-        # Keep only last N reviews
-        if len(history) > self.max_reviews:
-            history = history[-self.max_reviews:]
-        
-        self._save_history(history)
+        if self._file_records + 1 >= self.rotate_at:
+            self._save_history(history)
+        else:
+            dropped = cached[overflow - 1] if overflow > 0 else None
+            self._append_history(review_data, history, dropped)
         return review_id
     
-    def get_review(self, review_id: int) -> Optional[Dict]:
+    def get_review(self, review_id: int) -> Optional[ReviewRecord]:
         """
         Get a specific review by ID
         
@@ -86,13 +136,10 @@ class ReviewHistory:
         """
         history = self._load_history()
         
-        for review in history:
-            if review['id'] == review_id:
-                return review
-        
-        return None
+        index = self._id_index.get(review_id)
+        return history[index] if index is not None else None
     
-    def get_recent(self, limit: int = 10) -> List[Dict]:
+    def get_recent(self, limit: int = 10) -> List[ReviewRecord]:
         """
         Get recent reviews
         
@@ -102,10 +149,19 @@ class ReviewHistory:
         Returns:
             List of review dicts
         """
-        history = self._load_history()
+        # history[-0:] would be everything, so rule that out for both paths
+        if limit <= 0:
+            return []
+        limit = min(limit, self.max_reviews)
+        
+        # With nothing parsed yet, only the tail of the file needs decoding
+        if self._is_cached():
+            history = self._history_cache
+        else:
+            history = self._read_tail(limit)
         return history[-limit:][::-1]  # Last N, reversed (newest first)
     
-    def get_all(self) -> List[Dict]:
+    def get_all(self) -> List[ReviewRecord]:
         """
         Get all reviews
         
@@ -114,7 +170,7 @@ class ReviewHistory:
         """
         return self._load_history()[::-1]  # Newest first
     
-    def get_by_file(self, filepath: str) -> List[Dict]:
+    def get_by_file(self, filepath: str) -> List[ReviewRecord]:
         """
         Get all reviews for a specific file
         
@@ -127,14 +183,13 @@ class ReviewHistory:
         history = self._load_history()
         filename = Path(filepath).name
         
-        file_reviews = [
-            r for r in history 
-            if r['filename'] == filename or r['filepath'] == str(filepath)
-        ]
+        # Reviews matching on either name, each once, in history order
+        positions = set(self._file_index.get(filename, ()))
+        positions.update(self._file_index.get(str(filepath), ()))
         
-        return file_reviews[::-1]  # Newest first
+        return [history[i] for i in sorted(positions, reverse=True)]  # Newest first
     
-    def search(self, query: str) -> List[Dict]:
+    def search(self, query: str) -> List[ReviewRecord]:
         """
         Search reviews by content
         
@@ -144,16 +199,21 @@ class ReviewHistory:
         Returns:
             List of matching reviews
         """
+        from bisect import bisect_right
+        
         history = self._load_history()
+        corpus, offsets = self._search_corpus()
         query_lower = query.lower()
         
+        # One scan of the whole corpus; each hit skips ahead to the next review
         matches = []
-        for review in history:
-            # Search in review text, filename, and focus
-            if (query_lower in review['review'].lower() or
-                query_lower in review['filename'].lower() or
-                query_lower in review['focus'].lower()):
-                matches.append(review)
+        pos = corpus.find(query_lower)
+        while pos != -1:
+            i = bisect_right(offsets, pos) - 1
+            matches.append(history[i])
+            if i + 1 == len(offsets):
+                break
+            pos = corpus.find(query_lower, offsets[i + 1])
         
         return matches[::-1]  # Newest first
     
@@ -164,9 +224,14 @@ class ReviewHistory:
         Returns:
             Dict with stats
         """
-        history = self._load_history()
-        
-        if not history:
+        # Served from the sidecar; the history is only scanned if that is stale
+        stats = self._load_stats()
+        if stats is None:
+            stats = self._scan_stats(self._load_history())
+            if self.history_file.exists():
+                self._write_stats(stats)
+        
+        if not stats["reviews"]:
             return {
                 "total_reviews": 0,
                 "avg_score": 0,
@@ -174,16 +239,12 @@ class ReviewHistory:
                 "files_reviewed": 0
             }
         
-        scores = [r['score'] for r in history if r['score']]
-        costs = [r['cost'] for r in history if r['cost']]
-        files = set(r['filename'] for r in history)
-        
         return {
-            "total_reviews": len(history),
-            "avg_score": sum(scores) / len(scores) if scores else 0,
-            "total_cost": sum(costs) if costs else 0,
-            "files_reviewed": len(files),
-            "focus_breakdown": self._get_focus_breakdown(history)
+            "total_reviews": stats["reviews"],
+            "avg_score": stats["score_total"] / stats["score_count"] if stats["score_count"] else 0,
+            "total_cost": stats["cost_micro"] / 1_000_000,
+            "files_reviewed": len(stats["files"]),
+            "focus_breakdown": dict(stats["focus"])
         }
     
     def delete_review(self, review_id: int) -> bool:
@@ -196,15 +257,26 @@ class ReviewHistory:
         Returns:
             True if deleted, False if not found
         """
-        history = self._load_history()
+        history = list(self._load_history())
+        
+        index = self._id_index.get(review_id)
+        if index is None:
+            return False
+        
+        del history[index]
+        self._save_history(history)
+        return True
+    
+    def export(self) -> bytes:
+        """
+        Export the history as one indented JSON array
         
-        for i, review in enumerate(history):
-            if review['id'] == review_id:
-                history.pop(i)
-                self._save_history(history)
-                return True
+        The history file is compact JSON Lines; this is for reading it.
         
-        return False
+        Returns:
+            JSON bytes, oldest review first
+        """
+        return storage.dumps(self._load_history())
     
     def clear_all(self) -> int:
         """
@@ -220,45 +292,256 @@ class ReviewHistory:
     
     def _extract_score(self, review_text: str) -> Optional[int]:
         """Extract score from review text (e.g., 'Overall Score: 8/10')"""
-        import re
-        
-        # Look for patterns like "Score: 8/10" or "8/10"
-        patterns = [
-            r'Overall Score:\s*(\d+)/10',
-            r'Score:\s*(\d+)/10',
-            r'Rating:\s*(\d+)/10',
-            r'(\d+)/10'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, review_text, re.IGNORECASE)
+        # One scan settles the common case of no score at all
+        bare = _BARE_SCORE_RE.search(review_text)
+        if not bare:
+            return None
+        
+        for pattern in _SCORE_PATTERNS:
+            match = pattern.search(review_text)
             if match:
                 return int(match.group(1))
         
-        return None
+        return int(bare.group(1))
     
-    def _get_focus_breakdown(self, history: List[Dict]) -> Dict[str, int]:
-        """Get count of reviews by focus area"""
-        breakdown = {}
-        for review in history:
-            focus = review['focus']
-            breakdown[focus] = breakdown.get(focus, 0) + 1
-        return breakdown
+    def _load_history(self) -> List[ReviewRecord]:
+        """
+        Load review history from file
+        
+        The file is only re-parsed when it has changed; callers that modify
+        the list must copy it first.
+        """
+        try:
+            mtime = self.history_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._history_cache, self._history_mtime, self._file_records = [], None, 0
+            self._build_index()
+            return self._history_cache
+        
+        if mtime != self._history_mtime:
+            history = list(self._iter_history())
+            self._file_records = len(history)
+            self._history_cache = history[-self.max_reviews:]
+            self._history_mtime = mtime
+            self._build_index()
+        
+        return self._history_cache
     
-    def _load_history(self) -> List[Dict]:
-        """Load review history from file"""
-        if not self.history_file.exists():
-            return []
+    def _iter_history(self) -> Iterator[ReviewRecord]:
+        """Stream review records from the history file"""
+        try:
+            with open(self.history_file, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield storage.loads(line)
+                    except storage.JSONDecodeError:
+                        continue  # Skip a torn or corrupt line
+        except (FileNotFoundError, IOError):
+            return
+    
+    def _is_cached(self) -> bool:
+        """Check whether the parsed history still matches the file"""
+        try:
+            return self.history_file.stat().st_mtime_ns == self._history_mtime
+        except FileNotFoundError:
+            return False
+    
+    def _read_tail(self, limit: int) -> List[ReviewRecord]:
+        """
+        Parse only the last few reviews in the history file
+        
+        Args:
+            limit: Number of reviews to read
+            
+        Returns:
+            Up to `limit` review dicts, oldest first
+        """
+        from collections import deque
         
         try:
-            with open(self.history_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            with open(self.history_file, 'rb') as f:
+                lines = deque((line for line in f if line.strip()), maxlen=limit)
+        except (FileNotFoundError, IOError):
             return []
+        
+        tail = []
+        for line in lines:
+            try:
+                tail.append(storage.loads(line))
+            except storage.JSONDecodeError:
+                continue  # Skip a torn or corrupt line
+        return tail
     
-    def _save_history(self, history: List[Dict]):
-        """Save review history to file"""
+    def _append_history(
+        self,
+        review_data: ReviewRecord,
+        history: List[ReviewRecord],
+        dropped: Optional[ReviewRecord]
+    ):
+        """
+        Append one review to the history file and update the running stats
+        
+        Args:
+            review_data: Review to write
+            history: Cached history including the new review
+            dropped: Review that fell out of the last max_reviews, if any
+        """
         self.config_dir.mkdir(parents=True, exist_ok=True)
+        stats = self._load_stats()
+        
+        with open(self.history_file, 'ab') as f:
+            f.write(storage.dumps(review_data, indent=False) + b"\n")
+        
+        self._history_cache = history
+        self._history_mtime = self.history_file.stat().st_mtime_ns
+        self._file_records += 1
+        self._build_index()
+        
+        if stats is None:
+            stats = self._scan_stats(history)
+        else:
+            self._count_review(stats, review_data, 1)
+            if dropped is not None:
+                self._count_review(stats, dropped, -1)
+            stats["history_bytes"] = self.history_file.stat().st_size
+        self._write_stats(stats)
+    
+    def _save_history(self, history: List[ReviewRecord]):
+        """Rewrite the whole history file"""
+        self.config_dir.mkdir(parents=True, exist_ok=True)
+        
+        data = b"".join(storage.dumps(r, indent=False) + b"\n" for r in history)
+        storage.atomic_write(self.history_file, data)
+        
+        self._history_cache = history
+        self._history_mtime = self.history_file.stat().st_mtime_ns
+        self._file_records = len(history)
+        self._build_index()
+        self._write_stats(self._scan_stats(history))
+    
+    def _load_stats(self) -> Optional[Dict]:
+        """
+        Load the running stats, if they still match the history file
+        
+        Returns:
+            Stats dict, or None if missing or stale
+        """
+        try:
+            size = self.history_file.stat().st_size
+            stats = storage.loads(self.stats_file.read_bytes())
+        except (OSError, storage.JSONDecodeError):
+            return None
+        
+        if stats.get("history_bytes") != size:
+            return None
+        return stats
+    
+    def _scan_stats(self, history: List[ReviewRecord]) -> Dict:
+        """Rebuild the running stats from the retained history"""
+        try:
+            size = self.history_file.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        
+        # Tallied in bulk; _count_review is for one review at a time
+        scores = [r['score'] for r in history if r['score']]
+        return {
+            "reviews": len(history),
+            "score_total": sum(scores),
+            "score_count": len(scores),
+            # Whole micro-dollars, so adding and removing stays exact
+            "cost_micro": sum(round(r['cost'] * 1_000_000) for r in history if r['cost']),
+            "files": dict(Counter(r['filename'] for r in history)),   # Filename -> review count
+            "focus": dict(Counter(str(r['focus']) for r in history)),  # Focus -> review count
+            "history_bytes": size
+        }
+    
+    def _count_review(self, stats: Dict, review: ReviewRecord, sign: int):
+        """
+        Add a review to (sign 1) or remove it from (sign -1) the running stats
+        
+        Args:
+            stats: Stats dict to update in place
+            review: Review record
+            sign: 1 or -1
+        """
+        stats["reviews"] += sign
+        if review['score']:
+            stats["score_total"] += sign * review['score']
+            stats["score_count"] += sign
+        if review['cost']:
+            stats["cost_micro"] += sign * round(review['cost'] * 1_000_000)
+        
+        # str(): focus may be a Focus, and orjson only accepts plain str keys
+        for field, key in (("files", review['filename']), ("focus", str(review['focus']))):
+            count = stats[field].get(key, 0) + sign
+            if count:
+                stats[field][key] = count
+            else:
+                del stats[field][key]
+    
+    def _write_stats(self, stats: Dict):
+        """Save the running stats sidecar"""
+        storage.atomic_write(self.stats_file, storage.dumps(stats, indent=False))
+    
+    def _search_corpus(self) -> Tuple[str, List[int]]:
+        """
+        Get the lowercased search text of the cached history
+        
+        Each review's text, filename and focus are joined with NUL bytes, so
+        a match can't span two fields or two reviews.
+        
+        Returns:
+            Tuple of (corpus, start offset of each review in it)
+        """
+        if self._corpus is None:
+            parts = []
+            offsets = []
+            pos = 0
+            for review in self._history_cache:
+                part = "\0".join((review['review'], review['filename'], review['focus'])).lower() + "\0"
+                offsets.append(pos)
+                parts.append(part)
+                pos += len(part)
+            self._corpus = ("".join(parts), offsets)
+        
+        return self._corpus
+    
+    def _build_index(self):
+        """Map review IDs and file names to their positions in the cached history"""
+        self._corpus = None
+        self._id_index = {}
+        self._file_index = {}
+        for i, review in enumerate(self._history_cache):
+            self._id_index.setdefault(review['id'], i)  # First match wins, as before
+            for name in {review['filename'], review['filepath']}:
+                self._file_index.setdefault(name, []).append(i)
+    
+    def _migrate_legacy_history(self):
+        """Convert review_history.json (one JSON array) to JSON Lines"""
+        if not self.legacy_history_file.exists():
+            return
         
-        with open(self.history_file, 'w') as f:
-            json.dump(history, f, indent=2)
\ No newline at end of file
+        if not self.history_file.exists():
+            try:
+                history = storage.loads(self.legacy_history_file.read_bytes())
+            except (storage.JSONDecodeError, IOError):
+                history = []
+            self._save_history(history)
+        
+        self.legacy_history_file.unlink()
+
+
+_shared_history: Optional[ReviewHistory] = None
+
+
+def get_review_history() -> ReviewHistory:
+    """Get the process-wide ReviewHistory, creating it on first use"""
+    global _shared_history
+    
+    if _shared_history is None:
+        _shared_history = ReviewHistory(get_config().config_dir)
+    
+    return _shared_history
@@ -0,0 +1,63 @@
+"""
+JSON serialization helpers for Alfred's data files
+Uses orjson when installed, falling back to the standard library
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def loads(data: bytes):
+    """Parse JSON from bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent: bool = True) -> bytes:
+    """Serialize an object to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')  # Compact, like orjson
+
+
+def atomic_write(path: Path, data: bytes, mode: Optional[int] = None):
+    """
+    Write a file atomically
+    
+    Writes to a uniquely named temp file next to the target, syncs it and
+    renames it into place, so neither a crash mid-write nor two alfred
+    processes saving at once can leave a truncated or mixed file behind.
+    
+    Args:
+        path: Destination file
+        data: File contents
+        mode: Permission bits for the file, applied before it is visible
+    """
+    import tempfile
+    
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+# Raised by loads() on malformed input (orjson's error subclasses this)
+JSONDecodeError = json.JSONDecodeError
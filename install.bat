@@ -35,7 +35,7 @@ echo.
 
 echo [2/5] Installing Poetry and dependencies...
 pip install --quiet poetry >nul 2>&1
-poetry install --quiet
+poetry install --quiet --extras fast
 if errorlevel 1 (
     echo WARNING: Dependencies install had issues, continuing anyway...
 )
@@ -52,7 +52,7 @@ echo.
 
 echo [4/5] Installing Alfred...
 python -m pipx uninstall alfred >nul 2>&1
-python -m pipx install .
+python -m pipx install ".[fast]"
 if errorlevel 1 (
     echo ERROR: Failed to install Alfred
     pause
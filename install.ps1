@@ -38,7 +38,7 @@ function Complete-Loading {
 # Step 1: Poetry
 Show-Loading "[1/6] Installing Poetry and dependencies"
 pip install --quiet poetry 2>&1 | Out-Null
-poetry install --quiet 2>&1 | Out-Null
+poetry install --quiet --extras fast 2>&1 | Out-Null
 if ($LASTEXITCODE -eq 0) {
     Complete-Loading "Done"
 } else {
@@ -103,7 +103,7 @@ Complete-Loading "Done"
 # Step 5: Install Alfred (FRESH)
 Show-Loading "[5/6] Installing Alfred"
 
-$installOutput = python -m pipx install . 2>&1
+$installOutput = python -m pipx install ".[fast]" 2>&1
 $installExitCode = $LASTEXITCODE
 
 if ($installExitCode -eq 0) {
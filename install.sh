@@ -30,7 +30,7 @@ echo "[OK] Python found: $PYTHON_VERSION"
 echo ""
 echo "[1/5] Installing Poetry and dependencies..."
 python3 -m pip install --quiet --user poetry
-poetry install --quiet
+poetry install --quiet --extras fast
 echo "Done."
 
 echo ""
@@ -49,7 +49,7 @@ echo "[4/5] Installing Alfred..."
 python3 -m pipx uninstall alfred 2>/dev/null || true
 
 # Install
-python3 -m pipx install .
+python3 -m pipx install ".[fast]"
 echo "Done."
 
 echo ""
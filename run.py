@@ -4,8 +4,7 @@ Entry point for Alfred CLI
 This file is used by PyInstaller to build the standalone executable
 """
 
-import sys
-from alfred.cli import app
+from alfred import run
 
 if __name__ == "__main__":
-    app()
\ No newline at end of file
+    run()
\ No newline at end of file